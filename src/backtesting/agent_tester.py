@@ -1,12 +1,19 @@
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import pandas as pd
 import numpy as np
+import bottleneck as bn
+from numpy.lib.stride_tricks import sliding_window_view
 from datetime import datetime
 import asyncio
+import time
+from collections import deque
+import orjson
 from loguru import logger
 from pathlib import Path
 
-from src.services.technical_analysis import TechnicalAnalysis
+from src.services.technical_analysis import (
+    OHLCV_COLUMNS, ChartPattern, TechnicalAnalysis, ensure_ohlcv
+)
 from src.services.strategy import StrategyGenerator
 from src.services.risk_manager import RiskManager
 from src.backtesting.pattern_analyzer import PatternAnalyzer
@@ -29,34 +36,53 @@ class AgentTester:
                 "processing_times": []
             }
 
-            for i in range(len(data) - 100):  # Use 100-candle windows
-                window = data.iloc[i:i+100]
-                start_time = datetime.now()
+            window_size = 100  # Use 100-candle windows
+            n_windows = len(data) - window_size
+            ohlcv = ensure_ohlcv(data)
+            windows = sliding_window_view(ohlcv, (window_size, ohlcv.shape[1])).squeeze(1)
+
+            processing_times = np.empty(max(n_windows, 0), dtype=np.int64)
+            detected: List[ChartPattern] = []
+            detected_at: List[int] = []
+
+            # Pattern recognition runs once over every window instead of per slice
+            t0 = time.perf_counter_ns()
+            window_patterns = self.ta.analyze_chart_patterns_batch(windows[:n_windows], data.index)
+            batch_time = (time.perf_counter_ns() - t0) // max(n_windows, 1)
+
+            for i in range(n_windows):
+                t0 = time.perf_counter_ns()
 
-                # Test pattern recognition
-                patterns = await self.ta.analyze_chart_patterns(window)
-                options_analysis = await self.ta.analyze_options_market(window.to_dict())
+                patterns = window_patterns[i]
+                options_analysis = await self.ta.analyze_options_market(
+                    self._window_market_data(ohlcv, i, i + window_size)
+                )
                 
                 # Record processing time
-                processing_time = (datetime.now() - start_time).total_seconds()
-                results["processing_times"].append(processing_time)
+                processing_times[i] = time.perf_counter_ns() - t0 + batch_time
 
-                # Validate pattern completion
+                # Collect patterns for look-ahead validation after the loop
                 if patterns:
-                    for pattern in patterns:
-                        completion = self._validate_pattern_completion(
-                            pattern, 
-                            data.iloc[i+100:i+200]  # Look ahead for validation
-                        )
-                        results["pattern_recognition"].append(completion)
+                    detected.extend(patterns)
+                    detected_at.extend([i] * len(patterns))
 
                 # Validate indicator calculations
                 indicator_accuracy = self._validate_indicator_calculations(
                     options_analysis,
-                    window
+                    windows[i]
                 )
                 results["indicator_calculation"].append(indicator_accuracy)
 
+            # Validate pattern completion against the candles following each window
+            future_high, future_low = self._forward_extremes(ohlcv, window_size)
+            look_ahead = np.asarray(detected_at, dtype=np.intp) + window_size
+            results["pattern_recognition"] = self._validate_pattern_completions(
+                detected,
+                future_high[look_ahead],
+                future_low[look_ahead]
+            )
+
+            results["processing_times"] = processing_times * 1e-9
             return self._summarize_observer_results(results)
 
         except Exception as e:
@@ -107,6 +133,14 @@ class AgentTester:
                 "drawdown_prevention": []
             }
 
+            # Rolling aggregate of position validations, updated in O(1) per trade
+            running_stats = {
+                "count": 0,
+                "sum": 0.0,
+                "sum_sq": 0.0,
+                "recent": deque(maxlen=50)
+            }
+
             # Test position sizing
             for i in range(0, len(data), 100):  # Test every 100 candles
                 window = data.iloc[i:i+100]
@@ -128,6 +162,7 @@ class AgentTester:
                         window
                     )
                     results["position_sizing"].append(position_validation)
+                    self._update_running_stats(running_stats, position_validation)
 
                     # Test risk limits
                     risk_validation = await self._test_risk_limits(trade, window)
@@ -137,7 +172,7 @@ class AgentTester:
                     drawdown_test = self._test_drawdown_prevention(
                         trade,
                         window,
-                        previous_trades=results["position_sizing"]
+                        running_stats=running_stats
                     )
                     results["drawdown_prevention"].append(drawdown_test)
 
@@ -160,7 +195,7 @@ class AgentTester:
             }
             
             # Analyze patterns
-            patterns = pattern_analyzer.analyze_patterns(data)
+            patterns = await pattern_analyzer.analyze_patterns(data)
             
             # Test each pattern type
             for pattern_type, pattern_list in patterns.items():
@@ -195,39 +230,74 @@ class AgentTester:
             logger.error(f"Error testing pattern analysis: {e}")
             raise
 
-    def _validate_pattern_completion(self, pattern: Dict, future_data: pd.DataFrame) -> Dict:
-        """Validate if a detected pattern played out as expected"""
-        target_hit = False
-        stop_hit = False
-        profit = 0.0
+    def _window_market_data(self, ohlcv: np.ndarray, start: int, stop: int) -> Dict:
+        """Column views of an OHLCV window in the shape analyze_options_market reads"""
+        market_data = {col: ohlcv[start:stop, j] for j, col in enumerate(OHLCV_COLUMNS)}
+        market_data["closes"] = market_data["close"]
+        return market_data
+
+    def _forward_extremes(self, ohlcv: np.ndarray, horizon: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Highest high and lowest low over the next ``horizon`` candles from each row
+
+        Trailing moving extremes of the reversed series are leading extremes of the
+        original, computed in O(N) by bottleneck. Windows running past the end of
+        the data are truncated, matching a plain slice.
+        """
+        highs = ohlcv[::-1, OHLCV_COLUMNS.index("high")]
+        lows = ohlcv[::-1, OHLCV_COLUMNS.index("low")]
+        return (
+            bn.move_max(highs, horizon, min_count=1)[::-1],
+            bn.move_min(lows, horizon, min_count=1)[::-1]
+        )
 
-        if pattern["pattern_type"] in ["double_top", "head_and_shoulders"]:
-            target_hit = future_data["low"].min() <= pattern["price_target"]
-            stop_hit = future_data["high"].max() >= pattern["stop_loss"]
-        else:
-            target_hit = future_data["high"].max() >= pattern["price_target"]
-            stop_hit = future_data["low"].min() <= pattern["stop_loss"]
+    def _validate_pattern_completions(
+        self,
+        patterns: List[ChartPattern],
+        future_high: np.ndarray,
+        future_low: np.ndarray
+    ) -> Dict[str, np.ndarray]:
+        """Validate if detected patterns played out as expected
 
-        if target_hit and not stop_hit:
-            profit = abs(pattern["price_target"] - pattern["formation_points"][-1]["price"])
+        ``future_high``/``future_low`` hold, per pattern, the extremes of the
+        look-ahead candles, so every pattern is checked in one vectorized pass.
+        Results are returned as parallel arrays keyed by field name.
+        """
+        pattern_types = np.array([p.pattern_type for p in patterns], dtype=object)
+        bearish = np.isin(pattern_types, ["double_top", "head_and_shoulders"])
+        targets = np.array([p.price_target for p in patterns], dtype=np.float64)
+        stops = np.array([p.stop_loss for p in patterns], dtype=np.float64)
+        last_prices = np.array(
+            [p.formation_points[-1]["price"] for p in patterns], dtype=np.float64
+        )
+
+        target_hit = np.where(bearish, future_low <= targets, future_high >= targets)
+        stop_hit = np.where(bearish, future_high >= stops, future_low <= stops)
+        profit = np.where(target_hit & ~stop_hit, np.abs(targets - last_prices), 0.0)
 
         return {
-            "pattern_type": pattern["pattern_type"],
-            "target_hit": target_hit,
-            "stop_hit": stop_hit,
+            "pattern_type": pattern_types,
+            "target_hit": target_hit.astype(np.bool_),
+            "stop_hit": stop_hit.astype(np.bool_),
             "profit": profit,
-            "confidence": pattern["confidence"]
+            "confidence": np.array([p.confidence for p in patterns], dtype=np.float64)
         }
 
-    def _validate_indicator_calculations(self, analysis: Dict, data: pd.DataFrame) -> Dict:
-        """Validate technical indicator calculations"""
+    def _validate_indicator_calculations(self, analysis: Dict, window: np.ndarray) -> Dict:
+        """Validate technical indicator calculations against a (window, OHLCV_COLUMNS) array"""
         # Implementation for indicator validation
         pass
 
+    def _update_running_stats(self, stats: Dict, value: float) -> None:
+        """Fold one position validation into the running aggregate"""
+        stats["count"] += 1
+        stats["sum"] += value
+        stats["sum_sq"] += value * value
+        stats["recent"].append(value)
+
     def _summarize_observer_results(self, results: Dict) -> Dict:
         """Summarize Market Observer test results"""
-        pattern_accuracy = np.mean([r["target_hit"] for r in results["pattern_recognition"]])
-        avg_processing_time = np.mean(results["processing_times"])
+        pattern_accuracy = results["pattern_recognition"]["target_hit"].mean()
+        avg_processing_time = results["processing_times"].mean()
         
         return {
             "pattern_recognition_accuracy": pattern_accuracy,
@@ -241,10 +311,15 @@ class AgentTester:
         return {
             "strategies_generated": len(results["strategies"]),
             "regime_adaptation_score": np.mean(results["adaptations"]),
-            "average_profit_factor": np.mean([s["profit_factor"] for s in results["strategies"]]),
-            "win_rate": np.mean([s["win_rate"] for s in results["strategies"]])
+            "average_profit_factor": self._field_mean(results["strategies"], "profit_factor"),
+            "win_rate": self._field_mean(results["strategies"], "win_rate")
         }
 
+    def _field_mean(self, records: List[Dict], field: str) -> float:
+        """Mean of one numeric field across records without an intermediate list"""
+        values = np.fromiter((r[field] for r in records), dtype=np.float64, count=len(records))
+        return values.mean()
+
     def _summarize_risk_results(self, results: Dict) -> Dict:
         """Summarize Risk Manager test results"""
         return {
@@ -258,7 +333,8 @@ class AgentTester:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         results_file = self.results_dir / f"{test_name}_{timestamp}.json"
         
-        with open(results_file, 'w') as f:
-            json.dump(results, f, indent=2)
+        results_file.write_bytes(
+            orjson.dumps(results, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+        )
         
         logger.info(f"Test results saved to {results_file}") 
\ No newline at end of file
@@ -1,19 +1,162 @@
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
+import asyncio
+import functools
+from dataclasses import dataclass, field
+from pathlib import Path
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import argrelextrema
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.preprocessing import StandardScaler
 import tensorflow as tf
 from loguru import logger
 
+from src.services.technical_analysis import OHLCV_COLUMNS, ensure_ohlcv
+from src.utils.array_cache import ArrayLRUCache, frame_key
+from src.utils.jit import njit, prange
+
+WYCKOFF_PHASES = ["A", "B", "C", "D", "E"]
+PATTERN_TYPES = ["wyckoff_accumulation"]
+
+@dataclass
+class PatternBatch:
+    """Windowed patterns of one analyzer stored as parallel arrays
+
+    Every window in a batch spans the same number of candles. ``extra`` holds
+    any further per-pattern columns (e.g. Wyckoff phase) under their dict key.
+    """
+    start: np.ndarray       # int64 window start positions
+    end: np.ndarray         # int64 window end positions (exclusive)
+    confidence: np.ndarray  # float64 detection confidence
+    type_ids: np.ndarray    # int8 indices into PATTERN_TYPES
+    extra: Dict[str, np.ndarray] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+    def select(self, mask: np.ndarray) -> "PatternBatch":
+        return PatternBatch(
+            start=self.start[mask],
+            end=self.end[mask],
+            confidence=self.confidence[mask],
+            type_ids=self.type_ids[mask],
+            extra={key: values[mask] for key, values in self.extra.items()}
+        )
+
+    def windows(self, ohlcv: np.ndarray) -> np.ndarray:
+        """Gather the (n_patterns, window, n_columns) OHLCV windows in one fancy index"""
+        width = int(self.end[0] - self.start[0]) if len(self) else 0
+        return ohlcv[self.start[:, None] + np.arange(width)[None, :]]
+
+    def to_dicts(self) -> List[Dict]:
+        """Serialize to the dict-per-pattern form returned by analyze_patterns"""
+        columns = {
+            "type": np.array(PATTERN_TYPES)[self.type_ids].tolist(),
+            "start_idx": self.start.tolist(),
+            "end_idx": self.end.tolist(),
+            "confidence": self.confidence.tolist(),
+            **{key: values.tolist() for key, values in self.extra.items()}
+        }
+        return [dict(zip(columns, row)) for row in zip(*columns.values())]
+
+@njit(cache=True, fastmath=True, parallel=True)
+def _wyckoff_scan(ohlcv: np.ndarray, window: int):
+    """Scan every ``window``-candle slice for Wyckoff accumulation
+
+    Returns per-start-index arrays (hit mask, confidence, phase index into
+    WYCKOFF_PHASES). An accumulation is a selling climax in the first third of
+    the window (lowest low on at least twice the average volume) followed by a
+    range that holds above the climax low, allowing a spring undercut at the end.
+    """
+    n = max(ohlcv.shape[0] - window, 0)
+    third = window // 3
+    hits = np.zeros(n, dtype=np.bool_)
+    confs = np.zeros(n, dtype=np.float64)
+    phases = np.zeros(n, dtype=np.int8)
+
+    for i in prange(n):
+        high = ohlcv[i:i+window, 1]
+        low = ohlcv[i:i+window, 2]
+        close = ohlcv[i:i+window, 3]
+        volume = ohlcv[i:i+window, 4]
+
+        climax = np.argmin(low[:third])
+        avg_volume = volume.mean()
+        if avg_volume <= 0 or volume[climax] < 2 * avg_volume:
+            continue
+
+        range_low = low[climax]
+        range_high = high[climax:].max()
+        if range_high <= range_low:
+            continue
+
+        # The trading range must hold above the climax low until the final third
+        if low[climax+1:2*third].min() < range_low:
+            continue
+
+        last_close = close[window-1]
+        spring = low[2*third:].min() < range_low and last_close > range_low
+        if last_close < range_low:
+            continue
+
+        position = (last_close - range_low) / (range_high - range_low)
+        volume_score = min(volume[climax] / avg_volume / 4.0, 1.0)
+        hits[i] = True
+        confs[i] = 0.5 * volume_score + 0.3 * min(position, 1.0) + (0.2 if spring else 0.0)
+
+        if last_close > range_high:
+            phases[i] = 4
+        elif spring and position > 0.5:
+            phases[i] = 3
+        elif spring:
+            phases[i] = 2
+        elif climax < third // 2:
+            phases[i] = 1
+
+    return hits, confs, phases
+
+def _build_lstm_model() -> tf.keras.Model:
+    """Build LSTM model for pattern validation
+
+    The LSTM layers run under a mixed precision policy (float16 on GPU, bfloat16
+    on CPU) while the sigmoid output stays float32 for numerical safety.
+    """
+    policy = "mixed_float16" if tf.config.list_physical_devices("GPU") else "mixed_bfloat16"
+    model = tf.keras.Sequential([
+        tf.keras.layers.LSTM(50, return_sequences=True, input_shape=(100, 5), dtype=policy),
+        tf.keras.layers.LSTM(50, dtype=policy),
+        tf.keras.layers.Dense(1, activation='sigmoid', dtype='float32')
+    ])
+    model.compile(optimizer='adam', loss='binary_crossentropy', metrics=['accuracy'])
+    return model
+
+@functools.cache
+def _get_lstm_model() -> tf.keras.Model:
+    """LSTM validator shared by every PatternAnalyzer, built once per process"""
+    return _build_lstm_model()
+
+@tf.function(jit_compile=True, input_signature=[tf.TensorSpec((None, 100, 5), tf.float32)])
+def _lstm_infer(sequences: tf.Tensor) -> tf.Tensor:
+    """Compiled inference pass through the shared LSTM validator"""
+    return _get_lstm_model()(sequences, training=False)
+
 class PatternAnalyzer:
     def __init__(self):
-        self.rf_model = RandomForestClassifier(n_estimators=100)
+        self.rf_model = RandomForestClassifier(n_estimators=100, n_jobs=-1)
         self.scaler = StandardScaler()
-        self.lstm_model = self._build_lstm_model()
+        self.lstm_model = _get_lstm_model()
+        # Validated results depend on this instance's fitted models, so the cache
+        # is per instance; clear it after refitting rf_model or scaler
+        self._results_cache = ArrayLRUCache(maxsize=8)
         
-    def analyze_patterns(self, data: pd.DataFrame) -> Dict[str, List[Dict]]:
+    async def analyze_patterns(self, data: pd.DataFrame) -> Dict[str, List[Dict]]:
         """Analyze all significant crypto chart patterns"""
+        cache_key = frame_key(data)
+        cached = self._results_cache.get(cache_key)
+        if cached is not None:
+            return self._copy_results(cached)
+
         patterns = {
             "wyckoff": self._analyze_wyckoff(data),
             "orderblocks": self._analyze_orderblocks(data),
@@ -22,63 +165,102 @@ class PatternAnalyzer:
         }
         
         # Use ML to validate patterns
-        validated_patterns = self._validate_patterns_with_ml(patterns, data)
-        return validated_patterns
+        validated_patterns = await self._validate_patterns_with_ml(patterns, data)
+        self._results_cache.put(cache_key, validated_patterns)
+        return self._copy_results(validated_patterns)
 
-    def _analyze_wyckoff(self, data: pd.DataFrame) -> List[Dict]:
+    def _copy_results(self, results: Dict[str, List[Dict]]) -> Dict[str, List[Dict]]:
+        """Fresh containers for a cached result so callers cannot mutate the cache"""
+        return {
+            pattern_type: [dict(pattern) for pattern in pattern_list]
+            for pattern_type, pattern_list in results.items()
+        }
+
+    def _analyze_wyckoff(self, data: pd.DataFrame) -> PatternBatch:
         """Identify Wyckoff accumulation/distribution patterns"""
-        patterns = []
         window = 100  # Typical Wyckoff pattern window
-        
-        for i in range(len(data) - window):
-            slice_df = data.iloc[i:i+window]
-            
-            # Phase identification using volume and price action
-            if self._is_wyckoff_accumulation(slice_df):
-                patterns.append({
-                    "type": "wyckoff_accumulation",
-                    "start_idx": i,
-                    "end_idx": i + window,
-                    "confidence": self._calculate_wyckoff_confidence(slice_df),
-                    "phase": self._identify_wyckoff_phase(slice_df)
-                })
-                
-        return patterns
+        ohlcv = ensure_ohlcv(data)
+
+        # Phase identification using volume and price action
+        hits, confs, phases = _wyckoff_scan(ohlcv, window)
+        starts = np.flatnonzero(hits).astype(np.int64)
+        type_id = PATTERN_TYPES.index("wyckoff_accumulation")
+
+        return PatternBatch(
+            start=starts,
+            end=starts + window,
+            confidence=confs[starts],
+            type_ids=np.full(len(starts), type_id, dtype=np.int8),
+            extra={"phase": np.array(WYCKOFF_PHASES)[phases[starts]]}
+        )
 
     def _analyze_orderblocks(self, data: pd.DataFrame) -> List[Dict]:
         """Identify institutional orderblock patterns"""
-        patterns = []
-        
+        o, h, l, c, v = ensure_ohlcv(data).T
+        vol_mean = v.mean()
+
         # Look for strong rejection candles with high volume
-        for i in range(len(data) - 1):
-            if self._is_orderblock_candle(data.iloc[i]):
-                patterns.append({
-                    "type": "orderblock",
-                    "position": "bullish" if self._is_bullish_orderblock(data.iloc[i]) else "bearish",
-                    "price_level": data.iloc[i].close,
-                    "volume_ratio": data.iloc[i].volume / data.volume.mean(),
-                    "strength": self._calculate_orderblock_strength(data.iloc[i:i+10])
-                })
-                
-        return patterns
+        body = np.abs(c - o)
+        upper_wick = h - np.maximum(o, c)
+        lower_wick = np.minimum(o, c) - l
+        is_ob = (v > 2 * vol_mean) & (np.maximum(upper_wick, lower_wick) >= 2 * body)
+        is_ob[-1:] = False  # Need at least one follow-through candle
+        idx = np.flatnonzero(is_ob)
+        bullish = lower_wick[idx] > upper_wick[idx]
+
+        # Strength is the follow-through away from the level over the next 10 candles
+        horizon = 10
+        follow = sliding_window_view(np.concatenate([c, np.full(horizon - 1, np.nan)]), horizon)[idx]
+        strength = np.where(
+            bullish,
+            np.nanmax(follow, axis=1) - c[idx],
+            c[idx] - np.nanmin(follow, axis=1)
+        ) / c[idx]
+
+        return [
+            {
+                "type": "orderblock",
+                "position": "bullish" if is_bullish else "bearish",
+                "price_level": float(c[i]),
+                "volume_ratio": float(v[i] / vol_mean),
+                "strength": float(ob_strength)
+            }
+            for i, is_bullish, ob_strength in zip(idx, bullish, strength)
+        ]
 
     def _analyze_liquidity_levels(self, data: pd.DataFrame) -> List[Dict]:
         """Identify liquidity levels and sweeps"""
-        levels = []
-        
-        # Identify swing highs/lows with stop clusters
-        swings = self._find_swing_points(data)
-        for swing in swings:
-            if self._has_stop_cluster(data, swing["price"]):
-                levels.append({
-                    "type": "liquidity_level",
-                    "price": swing["price"],
-                    "side": swing["type"],  # "high" or "low"
-                    "strength": self._calculate_liquidity_strength(data, swing),
-                    "stop_density": self._calculate_stop_density(data, swing["price"])
-                })
-                
-        return levels
+        _, high, low, _, volume = ensure_ohlcv(data).T
+
+        # Identify swing highs/lows in one pass each
+        swing_order = 5
+        hi_idx = argrelextrema(high, np.greater, order=swing_order)[0]
+        lo_idx = argrelextrema(low, np.less, order=swing_order)[0]
+        idx = np.concatenate([hi_idx, lo_idx])
+        prices = np.concatenate([high[hi_idx], low[lo_idx]])
+        sides = np.array(["high"] * len(hi_idx) + ["low"] * len(lo_idx))
+
+        # Rolling volume density around each candle proxies for resting stop orders
+        density_window = 20
+        density = np.convolve(volume, np.ones(density_window) / density_window, mode="same")
+        avg_volume = volume.mean()
+        has_cluster = density[idx] > avg_volume
+
+        order = np.argsort(idx[has_cluster], kind="stable")
+        return [
+            {
+                "type": "liquidity_level",
+                "price": float(price),
+                "side": str(side),  # "high" or "low"
+                "strength": float(stop_density / avg_volume),
+                "stop_density": float(stop_density)
+            }
+            for price, side, stop_density in zip(
+                prices[has_cluster][order],
+                sides[has_cluster][order],
+                density[idx][has_cluster][order]
+            )
+        ]
 
     def _analyze_smc(self, data: pd.DataFrame) -> List[Dict]:
         """Smart Money Concepts analysis"""
@@ -91,40 +273,55 @@ class PatternAnalyzer:
         
         return patterns
 
-    def _build_lstm_model(self) -> tf.keras.Model:
-        """Build LSTM model for pattern validation"""
-        model = tf.keras.Sequential([
-            tf.keras.layers.LSTM(50, return_sequences=True, input_shape=(100, 5)),
-            tf.keras.layers.LSTM(50),
-            tf.keras.layers.Dense(1, activation='sigmoid')
-        ])
-        model.compile(optimizer='adam', loss='binary_crossentropy', metrics=['accuracy'])
-        return model
-
-    def _validate_patterns_with_ml(self, patterns: Dict, data: pd.DataFrame) -> Dict:
+    def export_quantized_lstm(self, path: str) -> None:
+        """Write a dynamic-range int8 quantized TFLite copy of the LSTM validator"""
+        converter = tf.lite.TFLiteConverter.from_keras_model(self.lstm_model)
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        Path(path).write_bytes(converter.convert())
+        logger.info(f"Quantized LSTM validator saved to {path}")
+
+    async def _validate_patterns_with_ml(self, patterns: Dict, data: pd.DataFrame) -> Dict:
         """Validate detected patterns using ML models"""
         validated_patterns = {}
         
         for pattern_type, pattern_list in patterns.items():
+            # The models reject empty inputs, and there is nothing to score
+            if not len(pattern_list):
+                validated_patterns[pattern_type] = []
+                continue
+
             features = self._extract_pattern_features(data, pattern_list)
             
-            # Random Forest validation
-            rf_scores = self.rf_model.predict_proba(features)
-            
-            # LSTM validation
-            lstm_scores = self._validate_with_lstm(data, pattern_list)
+            # Random Forest and LSTM validation release the GIL, so run them side by side
+            rf_scores, lstm_scores = await asyncio.gather(
+                asyncio.to_thread(self.rf_model.predict_proba, features),
+                asyncio.to_thread(self._validate_with_lstm, data, pattern_list)
+            )
             
             # Combine scores and filter patterns
+            ml_confidence = (rf_scores[:, 1] + lstm_scores) / 2
+            keep = ml_confidence > 0.7  # Only keep high confidence patterns
+            if isinstance(pattern_list, PatternBatch):
+                pattern_list = pattern_list.select(keep).to_dicts()
+            else:
+                pattern_list = [pattern for pattern, kept in zip(pattern_list, keep) if kept]
+
             validated_patterns[pattern_type] = [
-                {**pattern, "ml_confidence": (rf + lstm) / 2}
-                for pattern, rf, lstm in zip(pattern_list, rf_scores[:, 1], lstm_scores)
-                if (rf + lstm) / 2 > 0.7  # Only keep high confidence patterns
+                {**pattern, "ml_confidence": float(score)}
+                for pattern, score in zip(pattern_list, ml_confidence[keep])
             ]
             
         return validated_patterns
 
-    def _extract_pattern_features(self, data: pd.DataFrame, patterns: List[Dict]) -> np.ndarray:
+    def _extract_pattern_features(
+        self, data: pd.DataFrame, patterns: Union[PatternBatch, List[Dict]]
+    ) -> np.ndarray:
         """Extract features for ML validation"""
+        if isinstance(patterns, PatternBatch):
+            return self._extract_batch_features(
+                patterns.windows(ensure_ohlcv(data)), patterns.type_ids
+            )
+
         features = []
         for pattern in patterns:
             if "start_idx" in pattern and "end_idx" in pattern:
@@ -143,24 +340,47 @@ class PatternAnalyzer:
         
         return np.array(features)
 
-    def _validate_with_lstm(self, data: pd.DataFrame, patterns: List[Dict]) -> np.ndarray:
+    def _extract_batch_features(self, windows: np.ndarray, type_ids: np.ndarray) -> np.ndarray:
+        """Vectorized feature rows for a stack of (n_patterns, window, 5) OHLCV windows"""
+        if len(type_ids) == 0:
+            return np.empty((0, 4))
+
+        close = windows[:, :, OHLCV_COLUMNS.index("close")]
+        volume = windows[:, :, OHLCV_COLUMNS.index("volume")]
+        half = windows.shape[1] // 2
+
+        # Share of window volume traded in the later half
+        volume_profile = volume[:, half:].sum(axis=1) / volume.sum(axis=1)
+        momentum = close[:, -1] / close[:, 0] - 1
+        volatility = np.diff(np.log(close), axis=1).std(axis=1)
+
+        return np.column_stack([volume_profile, momentum, volatility, type_ids.astype(np.float64)])
+
+    def _validate_with_lstm(
+        self, data: pd.DataFrame, patterns: Union[PatternBatch, List[Dict]]
+    ) -> np.ndarray:
         """Validate patterns using LSTM model"""
-        sequences = []
-        for pattern in patterns:
+        if not len(patterns):
+            return np.empty(0, dtype=np.float32)
+
+        seq_len = 100
+        ohlcv = ensure_ohlcv(data)
+
+        # Shorter windows near the edges stay zero padded at the end
+        sequences = np.zeros((len(patterns), seq_len, len(OHLCV_COLUMNS)), dtype=np.float32)
+        if isinstance(patterns, PatternBatch):
+            windows = patterns.windows(ohlcv)[:, -seq_len:]
+            sequences[:, :windows.shape[1]] = windows
+            return _lstm_infer(tf.constant(sequences)).numpy().ravel()
+
+        for k, pattern in enumerate(patterns):
             if "start_idx" in pattern and "end_idx" in pattern:
-                window = data.iloc[pattern["start_idx"]:pattern["end_idx"]]
+                start, end = pattern["start_idx"], pattern["end_idx"]
             else:
                 idx = data.index.get_loc(pattern.get("timestamp", data.index[-1]))
-                window = data.iloc[max(0, idx-50):min(len(data), idx+50)]
-            
-            # Prepare sequence data
-            sequence = np.column_stack([
-                window.open, window.high, window.low, window.close, window.volume
-            ])
-            sequences.append(sequence)
-            
-        sequences = tf.keras.preprocessing.sequence.pad_sequences(
-            sequences, maxlen=100, padding='post'
-        )
-        
-        return self.lstm_model.predict(sequences) 
\ No newline at end of file
+                start, end = max(0, idx-50), min(len(data), idx+50)
+
+            window = ohlcv[start:end][-seq_len:]
+            sequences[k, :len(window)] = window
+
+        return _lstm_infer(tf.constant(sequences)).numpy().ravel()
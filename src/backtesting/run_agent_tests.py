@@ -6,6 +6,7 @@ from loguru import logger
 
 from src.backtesting.agent_tester import AgentTester
 from src.backtesting.data_collector import HistoricalDataCollector
+from src.services.technical_analysis import ensure_ohlcv
 
 async def run_agent_tests():
     try:
@@ -18,6 +19,9 @@ async def run_agent_tests():
         price_data = pd.read_parquet(data_path / "price_data.parquet")
         options_data = pd.read_parquet(data_path / "options_data.parquet")
 
+        # Convert prices once; every agent test reuses the cached OHLCV array
+        ensure_ohlcv(price_data)
+
         # Initialize tester
         tester = AgentTester()
 
@@ -0,0 +1,26 @@
+"""
+Ahead-of-time build of the TechnicalAnalysis indicator kernels.
+
+Run ``python -m src.services._aot_build`` at build/install time (requires the
+``jit`` extra and a C compiler). It writes the ``ta_kernels`` extension module
+next to this file; technical_analysis imports it when present and otherwise
+falls back to the @njit definitions, which compile on first call.
+"""
+from pathlib import Path
+
+from numba.pycc import CC
+
+from src.services import technical_analysis as ta
+
+cc = CC("ta_kernels")
+cc.output_dir = str(Path(__file__).resolve().parent)
+
+# Export the @njit sources, not the module-level names: those are rebound to
+# ta_kernels once it exists, which would break rebuilding.
+# Signatures match the PRICE_DTYPE (float32) arrays analyze_price_action passes
+cc.export("last_emas", "f4[:](f4[:], f8[:])")(ta._last_emas_jit.py_func)
+cc.export("last_macd", "UniTuple(f8, 2)(f4[:], f8, f8, f8)")(ta._last_macd_jit.py_func)
+cc.export("last_rsi", "f8(f4[:], i8)")(ta._last_rsi_jit.py_func)
+
+if __name__ == "__main__":
+    cc.compile()
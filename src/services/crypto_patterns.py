@@ -1,9 +1,109 @@
 from dataclasses import dataclass
-from typing import List, Dict
+from typing import List, Dict, Sequence, Tuple
 import pandas as pd
 import numpy as np
+import bottleneck as bn
+from numpy.lib.stride_tricks import sliding_window_view
 from loguru import logger
 
+from src.utils.jit import njit, prange
+
+SPRING_LOOKBACK = 5           # Bars at the end of a window in which a spring may form
+ORDERBLOCK_VOLUME_RATIO = 1.5  # Minimum candle volume relative to the window mean
+VOLUME_PROFILE_BUCKETS = 100   # Price buckets spanning the scanned frame's range
+VALUE_AREA_SHARE = 0.7         # Share of volume inside the value area
+
+@njit(cache=True)
+def _spring_scores(h, l, c, v, high_max, mean_volume):
+    """Confidence, target and stop for a Wyckoff spring in one window row
+
+    A spring undercuts the trading-range support inside the last SPRING_LOOKBACK
+    bars on above-average volume and closes the window back above support.
+    ``high_max``/``mean_volume`` are the window's rolling stats. Returns a zero
+    confidence when there is no spring.
+    """
+    split = l.size - SPRING_LOOKBACK
+    support = l[:split].min()
+    dip = split + np.argmin(l[split:])
+
+    if l[dip] >= support or c[-1] <= support or mean_volume <= 0:
+        return 0.0, np.nan, np.nan
+    volume_ratio = v[dip] / mean_volume
+    if volume_ratio < 1.0:
+        return 0.0, np.nan, np.nan
+
+    depth = (support - l[dip]) / (high_max - support) if high_max > support else 1.0
+    confidence = 0.5 * min(volume_ratio / 2.0, 1.0) + 0.5 * (1.0 - min(depth / 0.25, 1.0))
+    return confidence, high_max, l[dip]
+
+@njit(cache=True)
+def _orderblock_scores(o, h, l, c, v, high_max, low_min, mean_volume):
+    """Strength, target and stop for an orderblock at a window row's second-to-last candle
+
+    An orderblock is a high-volume candle against the move that the next bar
+    breaks through: a down candle whose high is closed above (bullish) or an up
+    candle whose low is closed below (bearish). Returns zero strength otherwise.
+    """
+    j = l.size - 2
+    if mean_volume <= 0 or v[j] < ORDERBLOCK_VOLUME_RATIO * mean_volume:
+        return 0.0, np.nan, np.nan
+    strength = min(v[j] / (2.0 * ORDERBLOCK_VOLUME_RATIO * mean_volume), 1.0)
+    if c[j] < o[j] and c[-1] > h[j]:
+        return strength, high_max, l[j]
+    if c[j] > o[j] and c[-1] < l[j]:
+        return strength, low_min, h[j]
+    return 0.0, np.nan, np.nan
+
+@njit(cache=True, parallel=True)
+def _wyckoff_spring_scan(h_win, l_win, c_win, v_win, high_max, volume_mean):
+    """Spring scores for every window; row i holds (confidence, target, stop)
+
+    ``*_win`` are (n - window + 1, window) sliding views and the rolling stats
+    are aligned to their rows. Row i of the output scores the window ending
+    at bar i-1, so the last full window is not scanned.
+    """
+    n_windows, window = c_win.shape
+    out = np.zeros((n_windows + window - 1, 3))
+    for r in prange(n_windows - 1):
+        out[r + window, 0], out[r + window, 1], out[r + window, 2] = _spring_scores(
+            h_win[r], l_win[r], c_win[r], v_win[r], high_max[r], volume_mean[r]
+        )
+    return out
+
+@njit(cache=True, parallel=True)
+def _orderblock_scan(o_win, h_win, l_win, c_win, v_win, high_max, low_min, volume_mean):
+    """Orderblock scores for every window; row i holds (strength, target, stop)"""
+    n_windows, window = c_win.shape
+    out = np.zeros((n_windows + window - 1, 3))
+    for r in prange(n_windows - 1):
+        out[r + window, 0], out[r + window, 1], out[r + window, 2] = _orderblock_scores(
+            o_win[r], h_win[r], l_win[r], c_win[r], v_win[r],
+            high_max[r], low_min[r], volume_mean[r]
+        )
+    return out
+
+@njit(cache=True)
+def _window_histograms(bucket_ids, volume, starts, ends, n_buckets):
+    """Volume per price bucket for each window ``[starts[k], ends[k])``
+
+    Windows must be ordered with non-decreasing starts and ends; the histogram
+    is slid forward by adding entering bars and removing expiring ones, so
+    the whole pass is O(n + windows * n_buckets).
+    """
+    out = np.zeros((starts.size, n_buckets))
+    hist = np.zeros(n_buckets)
+    lo = 0
+    hi = 0
+    for k in range(starts.size):
+        while hi < ends[k]:
+            hist[bucket_ids[hi]] += volume[hi]
+            hi += 1
+        while lo < starts[k]:
+            hist[bucket_ids[lo]] -= volume[lo]
+            lo += 1
+        out[k] = hist
+    return out
+
 @dataclass
 class CryptoPattern:
     pattern_type: str
@@ -15,6 +115,53 @@ class CryptoPattern:
     funding_rate: float              # Perpetual futures specific
     open_interest_impact: float
 
+# Kernel-scanned pattern types; CryptoPatternBatch.type_ids index into this list
+SCANNED_PATTERN_TYPES = ["wyckoff_spring", "orderblock"]
+
+@dataclass
+class CryptoPatternBatch:
+    """Kernel-scanned patterns as parallel arrays, one entry per hit
+
+    Each hit covers rows ``start[k]:end[k]`` of the scanned frame. Aggregations
+    read the numeric columns directly; CryptoPattern objects are only built
+    when market context is needed.
+    """
+    type_ids: np.ndarray     # uint8
+    start: np.ndarray        # intp
+    end: np.ndarray          # intp
+    confidence: np.ndarray
+    price_target: np.ndarray
+    stop_loss: np.ndarray
+
+    def __len__(self) -> int:
+        return self.type_ids.size
+
+    @classmethod
+    def from_scores(
+        cls,
+        pattern_type: str,
+        scores: np.ndarray,
+        window: int
+    ) -> "CryptoPatternBatch":
+        """Collect the rows of an (n, 3) kernel output with a positive score"""
+        end = np.flatnonzero(scores[:, 0] > 0)
+        type_id = SCANNED_PATTERN_TYPES.index(pattern_type)
+        return cls(
+            type_ids=np.full(end.size, type_id, dtype=np.uint8),
+            start=end - window,
+            end=end,
+            confidence=scores[end, 0],
+            price_target=scores[end, 1],
+            stop_loss=scores[end, 2]
+        )
+
+    @classmethod
+    def concat(cls, batches: Sequence["CryptoPatternBatch"]) -> "CryptoPatternBatch":
+        return cls(**{
+            name: np.concatenate([getattr(b, name) for b in batches])
+            for name in ("type_ids", "start", "end", "confidence", "price_target", "stop_loss")
+        })
+
 class CryptoPatternAnalyzer:
     """Crypto-specific chart pattern analyzer"""
     
@@ -44,26 +191,150 @@ class CryptoPatternAnalyzer:
         - Phase C (LPS - Last Point of Support)
         - Phase D (Sign of Strength)
         """
-        patterns = []
+        return self._to_patterns(df, self._scan_wyckoff_springs(df))
+
+    def scan_patterns(self, df: pd.DataFrame) -> CryptoPatternBatch:
+        """All kernel-scanned patterns (springs and orderblocks) in columnar form"""
+        return CryptoPatternBatch.concat([
+            self._scan_wyckoff_springs(df),
+            self._scan_orderblocks(df)
+        ])
+
+    def _scan_wyckoff_springs(self, df: pd.DataFrame) -> CryptoPatternBatch:
         window = 30  # Typical Wyckoff pattern window
-        
-        for i in range(window, len(df)):
-            slice_df = df.iloc[i-window:i]
-            
-            # Look for Spring pattern (key Wyckoff signal)
-            if self._is_spring_pattern(slice_df):
-                patterns.append(CryptoPattern(
-                    pattern_type="wyckoff_spring",
-                    confidence=self._calculate_spring_confidence(slice_df),
-                    price_target=self._calculate_wyckoff_target(slice_df, "spring"),
-                    stop_loss=slice_df['low'].min(),
-                    volume_profile=self._get_volume_profile(slice_df),
-                    liquidation_levels=self._find_nearby_liquidations(slice_df),
-                    funding_rate=self._get_current_funding_rate(slice_df),
-                    open_interest_impact=self._calculate_oi_impact(slice_df)
-                ))
-        
-        return patterns
+        if len(df) <= window:
+            return CryptoPatternBatch.from_scores("wyckoff_spring", np.zeros((0, 3)), window)
+
+        o, h, l, c, v = self._ohlcv_windows(df, window)
+        rolling = self._rolling_stats(df, window)
+        scores = _wyckoff_spring_scan(
+            h, l, c, v, rolling['high_max'], rolling['volume_mean']
+        )
+
+        # Look for Spring pattern (key Wyckoff signal)
+        return CryptoPatternBatch.from_scores("wyckoff_spring", scores, window)
+
+    def _to_patterns(self, df: pd.DataFrame, batch: CryptoPatternBatch) -> List[CryptoPattern]:
+        """Build CryptoPattern objects, with market context, for every hit in ``batch``"""
+        # One incremental histogram pass serves every hit's volume profile
+        bucket_ids, origin, bucket_size = self._volume_profile_grid(df)
+        histograms = _window_histograms(
+            bucket_ids,
+            df['volume'].to_numpy(dtype=np.float64),
+            batch.start,
+            batch.end,
+            VOLUME_PROFILE_BUCKETS
+        )
+        return [
+            self._build_pattern(
+                SCANNED_PATTERN_TYPES[batch.type_ids[k]],
+                df.iloc[batch.start[k]:batch.end[k]],
+                batch.confidence[k],
+                batch.price_target[k],
+                batch.stop_loss[k],
+                self._summarize_volume_profile(histograms[k], origin, bucket_size)
+            )
+            for k in range(len(batch))
+        ]
+
+    def _volume_profile_grid(self, df: pd.DataFrame) -> Tuple[np.ndarray, float, float]:
+        """int16 price bucket of each bar's typical price, plus the grid origin and step"""
+        high = df['high'].to_numpy(dtype=np.float64)
+        low = df['low'].to_numpy(dtype=np.float64)
+        typical = (high + low + df['close'].to_numpy(dtype=np.float64)) / 3
+        if not low.size:
+            return np.empty(0, dtype=np.int16), 0.0, 1.0
+        origin = low.min()
+        bucket_size = max((high.max() - origin) / VOLUME_PROFILE_BUCKETS, 1e-12)
+        bucket_ids = np.minimum(
+            ((typical - origin) / bucket_size).astype(np.int16), VOLUME_PROFILE_BUCKETS - 1
+        )
+        return bucket_ids, origin, bucket_size
+
+    def _summarize_volume_profile(
+        self,
+        histogram: np.ndarray,
+        origin: float,
+        bucket_size: float
+    ) -> Dict:
+        """Point of control and value area of a per-bucket volume histogram"""
+        histogram = np.maximum(histogram, 0.0)
+        total = histogram.sum()
+        if total <= 0:
+            return {
+                "point_of_control": np.nan,
+                "value_area_low": np.nan,
+                "value_area_high": np.nan,
+                "total_volume": 0.0
+            }
+
+        by_volume = np.argsort(histogram)[::-1]
+        n_value = np.searchsorted(np.cumsum(histogram[by_volume]), VALUE_AREA_SHARE * total) + 1
+        value_area = by_volume[:n_value]
+        return {
+            "point_of_control": float(origin + (by_volume[0] + 0.5) * bucket_size),
+            "value_area_low": float(origin + value_area.min() * bucket_size),
+            "value_area_high": float(origin + (value_area.max() + 1) * bucket_size),
+            "total_volume": float(total)
+        }
+
+    def _get_volume_profile(self, df: pd.DataFrame) -> Dict:
+        """Volume profile of a whole frame"""
+        bucket_ids, origin, bucket_size = self._volume_profile_grid(df)
+        histogram = np.bincount(
+            bucket_ids,
+            weights=df['volume'].to_numpy(dtype=np.float64),
+            minlength=VOLUME_PROFILE_BUCKETS
+        )
+        return self._summarize_volume_profile(histogram, origin, bucket_size)
+
+    def _build_pattern(
+        self,
+        pattern_type: str,
+        slice_df: pd.DataFrame,
+        confidence: float,
+        price_target: float,
+        stop_loss: float,
+        volume_profile: Dict
+    ) -> CryptoPattern:
+        """Wrap a kernel hit in a CryptoPattern with its market context"""
+        return CryptoPattern(
+            pattern_type=pattern_type,
+            confidence=float(confidence),
+            price_target=float(price_target),
+            stop_loss=float(stop_loss),
+            volume_profile=volume_profile,
+            liquidation_levels=self._find_nearby_liquidations(slice_df),
+            funding_rate=self._get_current_funding_rate(slice_df),
+            open_interest_impact=self._calculate_oi_impact(slice_df)
+        )
+
+    def _ohlcv_windows(self, df: pd.DataFrame, window: int) -> List[np.ndarray]:
+        """Zero-copy (n - window + 1, window) views of open/high/low/close/volume
+
+        Row r covers ``df.iloc[r:r+window]`` without building a DataFrame slice.
+        """
+        return [
+            sliding_window_view(df[col].to_numpy(dtype=np.float64), window)
+            for col in ['open', 'high', 'low', 'close', 'volume']
+        ]
+
+    def _rolling_stats(self, df: pd.DataFrame, window: int) -> Dict[str, np.ndarray]:
+        """Rolling extremes and means aligned to the rows of _ohlcv_windows
+
+        Entry r summarizes ``df.iloc[r:r+window]``, so scanners read scalars
+        instead of reducing a fresh DataFrame slice.
+        """
+        low = df['low'].to_numpy(dtype=np.float64)
+        high = df['high'].to_numpy(dtype=np.float64)
+        close = df['close'].to_numpy(dtype=np.float64)
+        volume = df['volume'].to_numpy(dtype=np.float64)
+        return {
+            "low_min": bn.move_min(low, window)[window - 1:],
+            "high_max": bn.move_max(high, window)[window - 1:],
+            "close_mean": bn.move_mean(close, window)[window - 1:],
+            "volume_mean": bn.move_mean(volume, window)[window - 1:]
+        }
 
     def _find_orderblocks(self, df: pd.DataFrame) -> List[CryptoPattern]:
         """
@@ -72,26 +343,21 @@ class CryptoPatternAnalyzer:
         - Bearish Orderblocks (strong rejection from above)
         - Focus on high volume nodes
         """
-        patterns = []
+        return self._to_patterns(df, self._scan_orderblocks(df))
+
+    def _scan_orderblocks(self, df: pd.DataFrame) -> CryptoPatternBatch:
         window = 15  # Orderblock formation window
-        
-        for i in range(window, len(df)):
-            slice_df = df.iloc[i-window:i]
-            
-            # Look for high volume rejection candles
-            if self._is_orderblock_candle(slice_df):
-                patterns.append(CryptoPattern(
-                    pattern_type="orderblock",
-                    confidence=self._calculate_orderblock_strength(slice_df),
-                    price_target=self._calculate_orderblock_target(slice_df),
-                    stop_loss=self._calculate_orderblock_invalidation(slice_df),
-                    volume_profile=self._get_volume_profile(slice_df),
-                    liquidation_levels=self._find_nearby_liquidations(slice_df),
-                    funding_rate=self._get_current_funding_rate(slice_df),
-                    open_interest_impact=self._calculate_oi_impact(slice_df)
-                ))
-        
-        return patterns
+        if len(df) <= window:
+            return CryptoPatternBatch.from_scores("orderblock", np.zeros((0, 3)), window)
+
+        o, h, l, c, v = self._ohlcv_windows(df, window)
+        rolling = self._rolling_stats(df, window)
+        scores = _orderblock_scan(
+            o, h, l, c, v, rolling['high_max'], rolling['low_min'], rolling['volume_mean']
+        )
+
+        # Look for high volume rejection candles
+        return CryptoPatternBatch.from_scores("orderblock", scores, window)
 
     def _find_liquidation_cascades(self, df: pd.DataFrame) -> List[CryptoPattern]:
         """
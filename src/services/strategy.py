@@ -1,5 +1,9 @@
-from typing import Dict, Optional, List
+from typing import Any, Dict, Optional, List
+import hashlib
 import json
+import math
+from types import MappingProxyType
+import orjson
 from datetime import datetime
 from loguru import logger
 from openai import AsyncOpenAI
@@ -14,13 +18,68 @@ from src.services.technical_analysis import TechnicalAnalysis
 
 settings = get_settings()
 
+PRICE_BUCKET = 0.005   # Relative price step of the strategy cache fingerprint
+IV_RANK_BUCKET = 5     # IV rank points per fingerprint bucket
+NEUTRAL_IV_RANK = 50.0  # Assumed IV rank when no options chain covers the bar
+
+REQUIRED_OUTPUT_FORMAT = {
+    "strategy_type": "string",  # e.g., "iron_condor", "calendar_spread"
+    "rationale": "string",      # Strategy selection reasoning
+    "legs": [
+        {
+            "option_type": "string",  # "call" or "put"
+            "strike": "float",
+            "expiry": "string",
+            "action": "string",       # "buy" or "sell"
+            "quantity": "integer"
+        }
+    ],
+    "entry_rules": {},          # Entry criteria
+    "exit_rules": {},           # Exit criteria
+    "greeks": {                 # Expected Greeks exposure
+        "delta": "float",
+        "gamma": "float",
+        "theta": "float",
+        "vega": "float"
+    },
+    "risk_metrics": {           # Risk parameters
+        "max_loss": "float",
+        "profit_potential": "float",
+        "probability_of_profit": "float"
+    },
+    "adjustments": ["string"]   # Adjustment triggers and actions
+}
+
+def _json_default(obj: Any) -> Any:
+    # OptionsAnalysis exposes its mappings as read-only MappingProxyType views
+    if isinstance(obj, MappingProxyType):
+        return dict(obj)
+    return str(obj)
+
+# Prompt payloads may carry numpy scalars, timestamps, non-string keys and mapping views
+ORJSON_KWARGS = {
+    "option": orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+    "default": _json_default
+}
+
+# Assistant run polling backs off from 50ms to at most 500ms between checks
+RUN_POLL_INITIAL = 0.05
+RUN_POLL_MAX = 0.5
+RUN_FAILED_STATUSES = {"failed", "cancelled", "expired", "requires_action"}
+
 class StrategyGenerator:
-    def __init__(self):
+    def __init__(self, backtest_mode: bool = False):
         self.client = None
         self.redis_client = RedisClient()
         self.assistant_id = None
         self.thread_id = None
         self.mock_mode = settings.ENABLE_MOCK_RESPONSES
+        # Backtests use the deterministic rule engine instead of the assistant
+        self.backtest_mode = backtest_mode
+        self._prompt_prefix_key = None
+        self._prompt_prefix_bytes = b""
+        # Shared so repeated polls of an unchanged snapshot hit the analysis cache
+        self.ta = TechnicalAnalysis()
 
     async def initialize(self):
         """Initialize OpenAI assistant and thread"""
@@ -100,6 +159,15 @@ class StrategyGenerator:
     async def generate_strategy(self, market_data: Dict) -> Dict:
         """Generate trading strategy based on market data"""
         try:
+            if self.backtest_mode:
+                return self._generate_rule_based_strategy(market_data)
+
+            # Reuse the strategy generated for an equivalent market state
+            cache_key = f"strat:{self._market_state_key(market_data)}"
+            cached = await self._get_cached_strategy(cache_key)
+            if cached:
+                return cached
+
             # Enrich market data with technical analysis
             enriched_data = await self._enrich_market_data(market_data)
             
@@ -108,38 +176,12 @@ class StrategyGenerator:
                 
             # Format market data for the assistant
             prompt = self._format_market_data(enriched_data)
-            
-            # Add message to thread
-            message = await self.client.beta.threads.messages.create(
-                thread_id=self.thread_id,
-                role="user",
-                content=prompt
-            )
-
-            # Run assistant
-            run = await self.client.beta.threads.runs.create(
-                thread_id=self.thread_id,
-                assistant_id=self.assistant_id
-            )
-
-            # Wait for completion
-            while True:
-                run_status = await self.client.beta.threads.runs.retrieve(
-                    thread_id=self.thread_id,
-                    run_id=run.id
-                )
-                if run_status.status == 'completed':
-                    break
-                await asyncio.sleep(1)
-
-            # Get response
-            messages = await self.client.beta.threads.messages.list(
-                thread_id=self.thread_id
-            )
+            response = await self._run_assistant(prompt)
             
             # Parse and validate strategy
-            strategy = self._parse_strategy_response(messages.data[0].content[0].text.value)
+            strategy = self._parse_strategy_response(response)
             if await self.validate_strategy(strategy):
+                await self._cache_strategy(cache_key, strategy)
                 return strategy
             
             raise ValueError("Invalid strategy generated")
@@ -148,6 +190,179 @@ class StrategyGenerator:
             logger.error(f"Error generating strategy: {e} - falling back to mock strategy")
             return self._generate_mock_strategy(market_data)
 
+    async def generate_strategies(self, market_data_list: List[Dict]) -> List[Optional[Dict]]:
+        """Generate strategies for several bars with a single assistant run
+
+        Cached market states are answered from Redis; the remaining snapshots
+        go out as one prompt asking for a JSON array of strategies in order.
+        Entries the assistant gets wrong fall back to the mock strategy.
+        """
+        if self.backtest_mode:
+            return [self._generate_rule_based_strategy(m) for m in market_data_list]
+
+        keys = [f"strat:{self._market_state_key(m)}" for m in market_data_list]
+        strategies = [await self._get_cached_strategy(key) for key in keys]
+        pending = [k for k, strategy in enumerate(strategies) if not strategy]
+        if not pending:
+            return strategies
+
+        try:
+            enriched = [await self._enrich_market_data(market_data_list[k]) for k in pending]
+            if self.mock_mode:
+                for k, market_data in zip(pending, enriched):
+                    strategies[k] = self._generate_mock_strategy(market_data)
+                return strategies
+
+            prompt = (
+                self._prompt_prefix()
+                + b',"snapshots":'
+                + orjson.dumps([self._market_payload(m) for m in enriched], **ORJSON_KWARGS)
+                + b',"response_format":"JSON array with one strategy per snapshot, in order"}'
+            ).decode()
+            responses = self._parse_strategy_list(await self._run_assistant(prompt))
+        except Exception as e:
+            logger.error(f"Error generating strategies: {e} - falling back to mock strategies")
+            responses = []
+
+        for n, k in enumerate(pending):
+            strategy = responses[n] if n < len(responses) else None
+            if strategy and await self.validate_strategy(strategy):
+                await self._cache_strategy(keys[k], strategy)
+                strategies[k] = strategy
+            else:
+                strategies[k] = self._generate_mock_strategy(market_data_list[k])
+
+        return strategies
+
+    async def _run_assistant(self, prompt: str) -> str:
+        """Post ``prompt`` to the thread, wait for the run and return the reply text"""
+        await self.client.beta.threads.messages.create(
+            thread_id=self.thread_id,
+            role="user",
+            content=prompt
+        )
+
+        run = await self.client.beta.threads.runs.create(
+            thread_id=self.thread_id,
+            assistant_id=self.assistant_id
+        )
+
+        # Wait for completion, backing off exponentially between checks
+        attempt = 0
+        while True:
+            run_status = await self.client.beta.threads.runs.retrieve(
+                thread_id=self.thread_id,
+                run_id=run.id
+            )
+            if run_status.status == 'completed':
+                break
+            if run_status.status in RUN_FAILED_STATUSES:
+                raise RuntimeError(f"Assistant run ended with status {run_status.status}")
+            await asyncio.sleep(min(RUN_POLL_INITIAL * 2 ** attempt, RUN_POLL_MAX))
+            attempt += 1
+
+        # Newest message first; only the reply is needed
+        messages = await self.client.beta.threads.messages.list(
+            thread_id=self.thread_id,
+            limit=1
+        )
+        return messages.data[0].content[0].text.value
+
+    def _market_state(self, market_data: Dict) -> Dict:
+        """Quantized fingerprint of the market: price bucket, IV rank bucket, trend and regime"""
+        price_data = market_data.get("price_data", {})
+        indicators = market_data.get("technical_indicators", {})
+        options_data = market_data.get("options_data", {})
+
+        close = price_data.get("close", market_data.get("price"))
+        iv_rank = options_data.get("iv_rank", market_data.get("iv_rank"))
+        trend_level = indicators.get("sma_200")
+
+        price_bucket = None
+        if close is not None and close > 0:
+            price_bucket = round(math.log(close) / math.log1p(PRICE_BUCKET))
+        iv_bucket = None
+        if iv_rank is not None and not math.isnan(iv_rank):
+            iv_bucket = int(iv_rank // IV_RANK_BUCKET) * IV_RANK_BUCKET
+        trend = market_data.get("trend", "neutral")
+        if close is not None and trend_level is not None and not math.isnan(trend_level):
+            trend = "bullish" if close > trend_level else "bearish"
+
+        return {
+            "symbol": market_data.get("symbol"),
+            "price": price_bucket,
+            "iv_rank": iv_bucket,
+            "trend": trend,
+            "regime": market_data.get("regime", "unknown")
+        }
+
+    def _market_state_key(self, market_data: Dict) -> str:
+        """Stable hash of the quantized market state"""
+        state = json.dumps(self._market_state(market_data), sort_keys=True)
+        return hashlib.blake2b(state.encode(), digest_size=16).hexdigest()
+
+    async def _get_cached_strategy(self, key: str) -> Optional[Dict]:
+        """Cached strategy for ``key``; a missing Redis connection is a cache miss"""
+        try:
+            return await self.redis_client.get_data(key)
+        except Exception as e:
+            logger.warning(f"Strategy cache unavailable: {e}")
+            return None
+
+    async def _cache_strategy(self, key: str, strategy: Dict) -> None:
+        """Store a validated strategy under its market state key"""
+        try:
+            await self.redis_client.set_data(key, strategy, expire=settings.STRATEGY_CACHE_TTL)
+        except Exception as e:
+            logger.warning(f"Could not cache strategy: {e}")
+
+    def _generate_rule_based_strategy(self, market_data: Dict) -> Optional[Dict]:
+        """Deterministic trend-following strategy for backtests
+
+        Trades in the direction of the close relative to EMA 21 and SMA 200, with
+        ATR-based stop and target. High IV rank sells premium, low IV rank buys it;
+        a missing IV rank counts as NEUTRAL_IV_RANK.
+        Returns None while indicators are warming up or the trend is mixed.
+        """
+        price_data = market_data.get("price_data", {})
+        indicators = market_data.get("technical_indicators", {})
+        options_data = market_data.get("options_data", {})
+
+        close = price_data.get("close")
+        ema = indicators.get("ema_21")
+        sma = indicators.get("sma_200")
+        atr = indicators.get("atr")
+        iv_rank = options_data.get("iv_rank")
+        if iv_rank is None or math.isnan(iv_rank):
+            iv_rank = NEUTRAL_IV_RANK
+        if any(v is None or math.isnan(v) for v in (close, ema, sma, atr)):
+            return None
+
+        if close > ema > sma:
+            action, direction = "BUY", 1
+        elif close < ema < sma:
+            action, direction = "SELL", -1
+        else:
+            return None
+
+        sells_premium = iv_rank >= 50
+        if direction > 0:
+            strategy_type = "bull_put_spread" if sells_premium else "bull_call_spread"
+        else:
+            strategy_type = "bear_call_spread" if sells_premium else "bear_put_spread"
+
+        return {
+            "action": action,
+            "symbol": market_data.get("symbol", "BTC-USDT"),
+            "entry_price": float(close),
+            "stop_loss": float(close - direction * 2 * atr),
+            "take_profit": float(close + direction * 3 * atr),
+            "position_size": 0.1,
+            "timeframe": "1h",
+            "confidence": min(abs(close - sma) / (3 * atr), 1.0) if atr > 0 else 0.0,
+            "strategy_type": strategy_type
+        }
+
     def _generate_mock_strategy(self, market_data: Dict) -> Dict:
         """Generate a mock strategy for testing"""
         return {
@@ -228,52 +443,48 @@ class StrategyGenerator:
                 await db.rollback()
 
     def _format_market_data(self, market_data: Dict) -> str:
-        """Format market data for the assistant"""
-        return json.dumps({
-            "request": "Generate options trading strategy",
+        """Format market data for the assistant
+
+        The static part of the prompt is serialized once; only the market
+        payload is encoded per call, without indentation.
+        """
+        payload = orjson.dumps(self._market_payload(market_data), **ORJSON_KWARGS)
+        return (self._prompt_prefix() + b"," + payload[1:]).decode()
+
+    def _prompt_prefix(self) -> bytes:
+        """Serialized static prompt fields, without the closing brace
+
+        Rebuilt only when the configured risk limits change.
+        """
+        risk_limits = settings.RISK_LIMITS
+        prefix_key = tuple(sorted(risk_limits.items()))
+        if prefix_key != self._prompt_prefix_key:
+            self._prompt_prefix_bytes = orjson.dumps({
+                "request": "Generate options trading strategy",
+                "risk_parameters": {
+                    "max_position_size": risk_limits["max_position_size"],
+                    "max_risk_per_trade": risk_limits["stop_loss_percentage"],
+                    "max_vega_exposure": risk_limits.get("max_vega_exposure", 0.1),
+                    "max_gamma_exposure": risk_limits.get("max_gamma_exposure", 0.1)
+                },
+                "required_output_format": REQUIRED_OUTPUT_FORMAT
+            })[:-1]
+            self._prompt_prefix_key = prefix_key
+        return self._prompt_prefix_bytes
+
+    def _market_payload(self, market_data: Dict) -> Dict:
+        """Per-bar prompt fields for one market snapshot"""
+        return {
             "market_data": market_data,
             "options_analysis": market_data.get("options_analysis", {}),
             "market_context": {
                 "current_trend": market_data.get("trend", "neutral"),
                 "recent_volatility": market_data.get("historical_volatility", 0),
                 "major_levels": market_data.get("support_resistance", []),
-                "upcoming_events": market_data.get("events", [])
-            },
-            "risk_parameters": {
-                "max_position_size": settings.RISK_LIMITS["max_position_size"],
-                "max_risk_per_trade": settings.RISK_LIMITS["stop_loss_percentage"],
-                "max_vega_exposure": settings.RISK_LIMITS.get("max_vega_exposure", 0.1),
-                "max_gamma_exposure": settings.RISK_LIMITS.get("max_gamma_exposure", 0.1),
+                "upcoming_events": market_data.get("events", []),
                 "portfolio_margin_used": market_data.get("margin_used", 0)
-            },
-            "required_output_format": {
-                "strategy_type": "string",  # e.g., "iron_condor", "calendar_spread"
-                "rationale": "string",      # Strategy selection reasoning
-                "legs": [
-                    {
-                        "option_type": "string",  # "call" or "put"
-                        "strike": "float",
-                        "expiry": "string",
-                        "action": "string",       # "buy" or "sell"
-                        "quantity": "integer"
-                    }
-                ],
-                "entry_rules": {},          # Entry criteria
-                "exit_rules": {},           # Exit criteria
-                "greeks": {                 # Expected Greeks exposure
-                    "delta": "float",
-                    "gamma": "float",
-                    "theta": "float",
-                    "vega": "float"
-                },
-                "risk_metrics": {           # Risk parameters
-                    "max_loss": "float",
-                    "profit_potential": "float",
-                    "probability_of_profit": "float"
-                },
-                "adjustments": ["string"]   # Adjustment triggers and actions
             }
-        }, indent=2)
+        }
 
     def _parse_strategy_response(self, response: str) -> Dict:
         """Parse and structure the assistant's response"""
@@ -289,15 +500,30 @@ class StrategyGenerator:
             logger.error(f"Error parsing strategy response: {e}")
             raise ValueError("Invalid strategy format")
 
+    def _parse_strategy_list(self, response: str) -> List[Dict]:
+        """Parse the JSON array of strategies returned for a batched prompt"""
+        try:
+            strategies_start = response.find('[')
+            strategies_end = response.rfind(']') + 1
+            strategies = json.loads(response[strategies_start:strategies_end])
+            return [s if isinstance(s, dict) else None for s in strategies]
+
+        except Exception as e:
+            logger.error(f"Error parsing strategy list response: {e}")
+            raise ValueError("Invalid strategy list format")
+
     async def stop(self):
         """Cleanup resources"""
         await self.redis_client.disconnect() 
 
     async def _enrich_market_data(self, market_data: Dict) -> Dict:
         """Enrich market data with technical analysis"""
+        # Backtests attach the options analysis precomputed for the bar
+        if "options_analysis" in market_data:
+            return market_data
+
         try:
-            ta = TechnicalAnalysis()
-            options_analysis = await ta.analyze_options_market(market_data)
+            options_analysis = await self.ta.analyze_options_market(market_data)
             
             return {
                 **market_data,
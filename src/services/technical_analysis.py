@@ -1,19 +1,213 @@
-from typing import Dict, List
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple
+from types import MappingProxyType
+import weakref
 import numpy as np
 import pandas as pd
+import bottleneck as bn
+from scipy.signal import find_peaks
 from loguru import logger
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
+
+from src.utils.array_cache import ArrayLRUCache, frame_key, mapping_key
+from src.utils.jit import njit, prange
+
+# Column order used for raw OHLCV ndarrays passed between services
+OHLCV_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+# Indicator math (SMA, EMA, MACD, RSI, ATR, Bollinger, VWAP) runs on float32 price
+# arrays: signals are insensitive at ~1e-6 relative error and half-width data halves
+# the memory traffic of these passes. Historical volatility stays float64, since
+# log returns of nearby prices lose too many digits in single precision.
+PRICE_DTYPE = np.float32
+
+# Chart-pattern peaks must be this many bars apart and stand out by this share of the average ATR
+PEAK_DISTANCE = 5
+PEAK_PROMINENCE_ATR = 0.5
+# Largest relative gap between the two tops of a double top / the two shoulders of an H&S
+DOUBLE_TOP_TOLERANCE = 0.02
+SHOULDER_TOLERANCE = 0.03
+
+_ohlcv_arrays: Dict[int, Tuple[Tuple, np.ndarray]] = {}
+
+def _ohlcv_version(df: pd.DataFrame) -> Tuple:
+    """Shape plus the buffer address of each OHLCV column
+
+    Assigning a column (``df['close'] = ...``) or reindexing swaps the buffer,
+    which changes the version and invalidates the cached array.
+    """
+    return (df.shape,) + tuple(
+        df[column].to_numpy().__array_interface__['data'][0] for column in OHLCV_COLUMNS
+    )
+
+def ensure_ohlcv(df: pd.DataFrame) -> np.ndarray:
+    """C-contiguous float32 OHLCV array for ``df``, converted once per frame version
+
+    The array is reused while the frame's OHLCV columns keep the same buffers;
+    element-wise writes into those buffers are not detected, so modify prices by
+    assigning whole columns once analysis starts.
+    """
+    key = id(df)
+    version = _ohlcv_version(df)
+    cached = _ohlcv_arrays.get(key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    ohlcv = np.ascontiguousarray(df[OHLCV_COLUMNS].to_numpy(dtype=np.float32))
+    if cached is None:
+        weakref.finalize(df, _ohlcv_arrays.pop, key, None)
+    _ohlcv_arrays[key] = (version, ohlcv)
+    return ohlcv
+
+@njit(cache=True, fastmath=True)
+def _last_emas_jit(close: np.ndarray, alphas: np.ndarray) -> np.ndarray:
+    """Final value of one ``ewm(adjust=False)`` EMA per alpha, all in one pass over ``close``"""
+    emas = np.full(alphas.size, close[0])
+    for i in range(1, close.size):
+        x = close[i]
+        for k in range(alphas.size):
+            emas[k] += alphas[k] * (x - emas[k])
+    return emas
+
+@njit(cache=True, fastmath=True)
+def _last_macd_jit(close: np.ndarray, fast_alpha: float, slow_alpha: float, signal_alpha: float):
+    """Final MACD line and signal; the signal EMA is advanced in the same loop"""
+    fast = slow = close[0]
+    macd = signal = 0.0
+    for i in range(1, close.size):
+        x = close[i]
+        fast += fast_alpha * (x - fast)
+        slow += slow_alpha * (x - slow)
+        macd = fast - slow
+        signal += signal_alpha * (macd - signal)
+    return macd, signal
+
+@njit(cache=True)
+def _last_rsi_jit(close: np.ndarray, period: int) -> float:
+    """Final Wilder RSI: averages seeded with the first ``period`` deltas, then smoothed"""
+    if close.size <= period:
+        return np.nan
+    avg_gain = avg_loss = 0.0
+    for i in range(1, close.size):
+        delta = close[i] - close[i - 1]
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        if i <= period:
+            avg_gain += gain / period
+            avg_loss += loss / period
+        else:
+            avg_gain = (avg_gain * (period - 1) + gain) / period
+            avg_loss = (avg_loss * (period - 1) + loss) / period
+    if avg_loss == 0:
+        return 100.0
+    return 100 - 100 / (1 + avg_gain / avg_loss)
+
+try:
+    # Built by _aot_build.py; takes PRICE_DTYPE arrays and skips first-call JIT compilation
+    from src.services.ta_kernels import last_emas as _last_emas
+    from src.services.ta_kernels import last_macd as _last_macd
+    from src.services.ta_kernels import last_rsi as _last_rsi
+except ImportError:
+    _last_emas, _last_macd, _last_rsi = _last_emas_jit, _last_macd_jit, _last_rsi_jit
+
+# Pattern scans work on tops: bottoms are scanned as tops of (-low, -high). Row k
+# of every output describes the look back window whose extrema are
+# extrema[first[k]:last[k]]; ``atr`` is the ATR at that window's last bar.
+
+@njit(cache=True, parallel=True)
+def _double_top_scan(x, y, volume, extrema, first, last, atr, tolerance):
+    """Double tops formed by the last two extrema of each window
+
+    The tops must agree within ``tolerance`` and the neckline (lowest ``y``
+    between them) must sit more than one ATR below the lower top.
+    """
+    n = first.size
+    hits = np.zeros(n, dtype=np.bool_)
+    confs = np.zeros(n, dtype=np.float64)
+    targets = np.zeros(n, dtype=np.float64)
+    confirms = np.zeros(n, dtype=np.bool_)
+    points = np.zeros((n, 2), dtype=np.int64)
+
+    for k in prange(n):
+        if last[k] - first[k] < 2:
+            continue
+        a = extrema[last[k] - 2]
+        b = extrema[last[k] - 1]
+        top = max(x[a], x[b])
+        gap = abs(x[a] - x[b]) / abs(top)
+        if gap > tolerance:
+            continue
+        neckline = y[a:b + 1].min()
+        depth = min(x[a], x[b]) - neckline
+        if not depth > atr[k]:
+            continue
+
+        hits[k] = True
+        confirms[k] = volume[b] < volume[a]
+        confs[k] = (
+            0.5 * (1.0 - gap / tolerance)
+            + 0.3 * min(depth / (3.0 * atr[k]), 1.0)
+            + (0.2 if confirms[k] else 0.0)
+        )
+        targets[k] = neckline - (top - neckline)
+        points[k, 0] = a
+        points[k, 1] = b
+
+    return hits, confs, targets, confirms, points
+
+@njit(cache=True, parallel=True)
+def _head_and_shoulders_scan(x, y, volume, extrema, first, last, atr, tolerance):
+    """Head and shoulders formed by the last three extrema of each window
+
+    The head must top both shoulders, the shoulders must agree within
+    ``tolerance``, and the head must rise more than one ATR above the neckline.
+    """
+    n = first.size
+    hits = np.zeros(n, dtype=np.bool_)
+    confs = np.zeros(n, dtype=np.float64)
+    targets = np.zeros(n, dtype=np.float64)
+    confirms = np.zeros(n, dtype=np.bool_)
+    points = np.zeros((n, 3), dtype=np.int64)
+
+    for k in prange(n):
+        if last[k] - first[k] < 3:
+            continue
+        left = extrema[last[k] - 3]
+        head = extrema[last[k] - 2]
+        right = extrema[last[k] - 1]
+        shoulder = max(x[left], x[right])
+        if x[head] <= shoulder:
+            continue
+        gap = abs(x[left] - x[right]) / abs(shoulder)
+        if gap > tolerance:
+            continue
+        neckline = y[left:right + 1].min()
+        depth = x[head] - neckline
+        if not depth > atr[k]:
+            continue
+
+        hits[k] = True
+        confirms[k] = volume[right] < volume[left]
+        confs[k] = (
+            0.5 * (1.0 - gap / tolerance)
+            + 0.3 * min((x[head] - shoulder) / atr[k], 1.0)
+            + (0.2 if confirms[k] else 0.0)
+        )
+        targets[k] = neckline - depth
+        points[k, 0] = left
+        points[k, 1] = head
+        points[k, 2] = right
+
+    return hits, confs, targets, confirms, points
 
 @dataclass
 class OptionsAnalysis:
     iv_rank: float  # Implied Volatility Rank
     iv_percentile: float  # IV Percentile
     historical_volatility: float
-    term_structure: Dict[str, float]  # Volatility term structure
-    skew: Dict[str, float]  # Volatility skew
+    term_structure: Mapping[str, float]  # Volatility term structure (read-only view)
+    skew: Mapping[str, float]  # Volatility skew (read-only view)
     gamma_exposure: float
     put_call_ratio: float
-    open_interest: Dict[str, int]
+    open_interest: Mapping[str, int]  # Read-only view
     max_pain: float
 
 @dataclass
@@ -52,10 +246,23 @@ class CandlestickPattern:
 class TechnicalAnalysis:
     def __init__(self):
         self.lookback_period = 30  # Default 30 days for historical calculations
+        self._chart_pattern_cache = ArrayLRUCache(maxsize=256)
+        # Results are shared between calls on identical inputs; treat them as read-only
+        self._options_cache = ArrayLRUCache(maxsize=16)
+        self._price_action_cache = ArrayLRUCache(maxsize=16)
 
     async def analyze_options_market(self, market_data: Dict) -> OptionsAnalysis:
         """Analyze options market data with key indicators"""
         try:
+            try:
+                cache_key = mapping_key(market_data)
+            except TypeError:
+                # Payload has values without an exact key; analyze it uncached
+                cache_key = None
+            cached = self._options_cache.get(cache_key) if cache_key else None
+            if cached is not None:
+                return cached
+
             # Calculate options-specific indicators
             iv_rank = self._calculate_iv_rank(market_data)
             iv_percentile = self._calculate_iv_percentile(market_data)
@@ -67,7 +274,7 @@ class TechnicalAnalysis:
             oi = self._analyze_open_interest(market_data)
             max_pain = self._calculate_max_pain(market_data)
 
-            return OptionsAnalysis(
+            analysis = OptionsAnalysis(
                 iv_rank=iv_rank,
                 iv_percentile=iv_percentile,
                 historical_volatility=hv,
@@ -78,42 +285,53 @@ class TechnicalAnalysis:
                 open_interest=oi,
                 max_pain=max_pain
             )
+            if cache_key:
+                self._options_cache.put(cache_key, analysis)
+            return analysis
 
         except Exception as e:
-            logger.error(f"Error analyzing options market: {e}")
+            logger.error("Error analyzing options market: {}", e)
             raise
 
     async def analyze_price_action(self, data: Dict) -> PriceAnalysis:
-        """Analyze underlying asset's price action"""
-        df = pd.DataFrame(data['price_history'])
-        
+        """Analyze underlying asset's price action
+
+        ``data['price_history']`` maps column names to arrays. The price columns are
+        viewed (or converted once) as PRICE_DTYPE ndarrays and shared by the array
+        helpers, which compute only the latest value of each indicator.
+        """
+        prices: Dict[str, np.ndarray] = data['price_history']
+        high, low, close, volume = (
+            np.ascontiguousarray(prices[column], dtype=PRICE_DTYPE)
+            for column in ("high", "low", "close", "volume")
+        )
+        # The trend, level and regime helpers read all of ``prices``, so every column is keyed
+        try:
+            cache_key = mapping_key(prices)
+        except TypeError:
+            cache_key = None
+        cached = self._price_action_cache.get(cache_key) if cache_key else None
+        if cached is not None:
+            return self._copy_price_analysis(cached)
+
         # Calculate moving averages
-        sma = {
-            "20": self._calculate_sma(df, 20),
-            "50": self._calculate_sma(df, 50),
-            "200": self._calculate_sma(df, 200)
-        }
-        
-        ema = {
-            "9": self._calculate_ema(df, 9),
-            "21": self._calculate_ema(df, 21),
-            "55": self._calculate_ema(df, 55)
-        }
-        
+        sma = {str(period): self._calculate_sma(close, period) for period in (20, 50, 200)}
+        ema = self._calculate_emas(close, (9, 21, 55))
+
         # Calculate other indicators
-        vwap = self._calculate_vwap(df)
-        rsi = self._calculate_rsi(df)
-        macd = self._calculate_macd(df)
-        stoch = self._calculate_stochastic(df)
-        boll = self._calculate_bollinger_bands(df)
-        atr = self._calculate_atr(df)
+        vwap = self._calculate_vwap(high, low, close, volume)
+        rsi = self._calculate_rsi(close)
+        macd = self._calculate_macd(close)
+        stoch = self._calculate_stochastic(high, low, close)
+        boll = self._calculate_bollinger_bands(close)
+        atr = self._calculate_atr(high, low, close)
 
         # Analyze trend and volatility context
-        trend_strength = self._analyze_trend_strength(df, ema, macd)
-        support_resistance = self._find_support_resistance(df)
-        vol_regime = self._determine_volatility_regime(df, boll["middle"], atr)
+        trend_strength = self._analyze_trend_strength(prices, ema, macd)
+        support_resistance = self._find_support_resistance(prices)
+        vol_regime = self._determine_volatility_regime(prices, boll["middle"], atr)
 
-        return PriceAnalysis(
+        analysis = PriceAnalysis(
             sma=sma,
             ema=ema,
             vwap=vwap,
@@ -126,6 +344,17 @@ class TechnicalAnalysis:
             support_resistance=support_resistance,
             volatility_regime=vol_regime
         )
+        if cache_key:
+            self._price_action_cache.put(cache_key, analysis)
+        return self._copy_price_analysis(analysis)
+
+    def _copy_price_analysis(self, analysis: PriceAnalysis) -> PriceAnalysis:
+        """Fresh indicator containers for a cached result so callers cannot mutate the cache"""
+        return replace(analysis, **{
+            name: type(value)(value)
+            for name, value in vars(analysis).items()
+            if isinstance(value, (dict, list))
+        })
 
     def _calculate_iv_rank(self, data: Dict) -> float:
         """Calculate IV Rank (current IV's position between 52-week high and low)"""
@@ -140,108 +369,150 @@ class TechnicalAnalysis:
         current_iv = data['current_iv']
         return (historical_ivs < current_iv).mean() * 100
 
-    def _analyze_volatility_term_structure(self, data: Dict) -> Dict[str, float]:
+    def _analyze_volatility_term_structure(self, data: Dict) -> Mapping[str, float]:
         """Analyze volatility across different expiration dates"""
-        return {
-            expiry: iv 
-            for expiry, iv in data['term_structure'].items()
-        }
+        return MappingProxyType(data['term_structure'])
 
-    def _analyze_volatility_skew(self, data: Dict) -> Dict[str, float]:
+    def _analyze_volatility_skew(self, data: Dict) -> Mapping[str, float]:
         """Analyze volatility skew (difference in IV between OTM puts and calls)"""
-        return {
-            strike: iv_diff 
-            for strike, iv_diff in data['skew_data'].items()
-        }
+        return MappingProxyType(data['skew_data'])
 
     def _calculate_gamma_exposure(self, data: Dict) -> float:
         """Calculate total gamma exposure at different price levels"""
-        return sum(
-            position['gamma'] * position['open_interest']
-            for position in data['options_positions']
+        gammas, open_interest = self._position_arrays(data['options_positions'])
+        return float(gammas @ open_interest)
+
+    def _position_arrays(self, positions) -> Tuple[np.ndarray, np.ndarray]:
+        """Gamma and open-interest arrays from columnar or per-position records
+
+        Columnar input ({"gamma": [...], "open_interest": [...]}) is used as is;
+        a list of position dicts is unpacked once.
+        """
+        if isinstance(positions, dict):
+            return (
+                np.asarray(positions['gamma'], dtype=np.float64),
+                np.asarray(positions['open_interest'], dtype=np.float64)
+            )
+        n = len(positions)
+        return (
+            np.fromiter((p['gamma'] for p in positions), dtype=np.float64, count=n),
+            np.fromiter((p['open_interest'] for p in positions), dtype=np.float64, count=n)
         )
 
     def _calculate_put_call_ratio(self, data: Dict) -> float:
         """Calculate put/call ratio based on volume and open interest"""
-        put_volume = sum(data['put_volumes'].values())
-        call_volume = sum(data['call_volumes'].values())
-        return put_volume / call_volume if call_volume > 0 else float('inf')
+        put_volumes, call_volumes = data['put_volumes'], data['call_volumes']
+        put_volume = np.fromiter(put_volumes.values(), dtype=np.float64, count=len(put_volumes)).sum()
+        call_volume = np.fromiter(call_volumes.values(), dtype=np.float64, count=len(call_volumes)).sum()
+        return float(put_volume / call_volume) if call_volume > 0 else float('inf')
 
-    def _analyze_open_interest(self, data: Dict) -> Dict[str, int]:
+    def _analyze_open_interest(self, data: Dict) -> Mapping[str, int]:
         """Analyze open interest distribution across strikes"""
-        return {
-            strike: oi 
-            for strike, oi in data['open_interest'].items()
-        }
+        return MappingProxyType(data['open_interest'])
 
     def _calculate_max_pain(self, data: Dict) -> float:
-        """Calculate max pain point (strike price where options sellers have least liability)"""
-        total_value = {}
-        for strike in data['strikes']:
-            value = self._calculate_options_value_at_strike(data, strike)
-            total_value[strike] = value
-        return min(total_value.items(), key=lambda x: x[1])[0]
+        """Calculate max pain point (strike price where options sellers have least liability)
+
+        Option holders' intrinsic value at every candidate expiry price is one
+        (strikes x contracts) broadcast over the call and put open interest.
+        """
+        strikes = np.asarray(data['strikes'], dtype=np.float64)
+        call_strikes, call_oi = self._strike_arrays(data['call_open_interest'])
+        put_strikes, put_oi = self._strike_arrays(data['put_open_interest'])
+        settle = strikes[:, None]
+        pain = (
+            np.maximum(settle - call_strikes, 0) @ call_oi
+            + np.maximum(put_strikes - settle, 0) @ put_oi
+        )
+        return float(strikes[pain.argmin()])
+
+    def _strike_arrays(self, by_strike: Dict) -> Tuple[np.ndarray, np.ndarray]:
+        """Parallel strike and value arrays from a strike-keyed mapping"""
+        n = len(by_strike)
+        strikes = np.fromiter(map(float, by_strike.keys()), dtype=np.float64, count=n)
+        values = np.fromiter(by_strike.values(), dtype=np.float64, count=n)
+        return strikes, values
 
     def _calculate_historical_volatility(self, data: Dict) -> float:
         """Calculate historical volatility"""
-        returns = np.log(data['closes'][1:] / data['closes'][:-1])
-        return np.std(returns) * np.sqrt(365) * 100 
-
-    def _calculate_sma(self, df: pd.DataFrame, period: int) -> float:
-        return df['close'].rolling(window=period).mean().iloc[-1]
-
-    def _calculate_ema(self, df: pd.DataFrame, period: int) -> float:
-        return df['close'].ewm(span=period, adjust=False).mean().iloc[-1]
-
-    def _calculate_vwap(self, df: pd.DataFrame) -> float:
-        typical_price = (df['high'] + df['low'] + df['close']) / 3
-        return (typical_price * df['volume']).sum() / df['volume'].sum()
-
-    def _calculate_rsi(self, df: pd.DataFrame, period: int = 14) -> float:
-        delta = df['close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        rs = gain / loss
-        return 100 - (100 / (1 + rs.iloc[-1]))
-
-    def _calculate_macd(self, df: pd.DataFrame) -> Dict[str, float]:
-        exp1 = df['close'].ewm(span=12, adjust=False).mean()
-        exp2 = df['close'].ewm(span=26, adjust=False).mean()
-        macd_line = exp1 - exp2
-        signal_line = macd_line.ewm(span=9, adjust=False).mean()
-        histogram = macd_line - signal_line
-        return {
-            "macd": macd_line.iloc[-1],
-            "signal": signal_line.iloc[-1],
-            "histogram": histogram.iloc[-1]
-        }
-
-    def _calculate_stochastic(self, df: pd.DataFrame) -> Dict[str, float]:
-        low_min = df['low'].rolling(14).min()
-        high_max = df['high'].rolling(14).max()
-        k = 100 * (df['close'] - low_min) / (high_max - low_min)
-        d = k.rolling(3).mean()
-        return {"k": k.iloc[-1], "d": d.iloc[-1]}
-
-    def _calculate_bollinger_bands(self, df: pd.DataFrame) -> Dict[str, float]:
-        middle = df['close'].rolling(20).mean()
-        std = df['close'].rolling(20).std()
-        return {
-            "upper": middle + (2 * std),
-            "middle": middle,
-            "lower": middle - (2 * std)
-        }
-
-    def _calculate_atr(self, df: pd.DataFrame, period: int = 14) -> float:
-        high_low = df['high'] - df['low']
-        high_close = abs(df['high'] - df['close'].shift())
-        low_close = abs(df['low'] - df['close'].shift())
-        ranges = pd.concat([high_low, high_close, low_close], axis=1)
-        true_range = ranges.max(axis=1)
-        return true_range.rolling(period).mean().iloc[-1]
+        # One log pass and one diff instead of a sliced ratio plus its log
+        returns = np.diff(np.log(np.asarray(data['closes'], dtype=np.float64)))
+        return returns.std() * np.sqrt(365) * 100
+
+    def _calculate_sma(self, close: np.ndarray, period: int) -> float:
+        # Only the last value is reported, so average the tail instead of rolling
+        return float(close[-period:].mean()) if close.size >= period else np.nan
+
+    def _calculate_emas(self, close: np.ndarray, periods: Tuple[int, ...]) -> Dict[str, float]:
+        alphas = np.array([2 / (period + 1) for period in periods])
+        return dict(zip(map(str, periods), _last_emas(close, alphas).tolist()))
+
+    def _calculate_macd(self, close: np.ndarray) -> Dict[str, float]:
+        macd, signal = _last_macd(close, 2 / 13, 2 / 27, 2 / 10)
+        return {"macd": macd, "signal": signal, "histogram": macd - signal}
+
+    def _calculate_bollinger_bands(self, close: np.ndarray, period: int = 20) -> Dict[str, float]:
+        if close.size < period:
+            return {"upper": np.nan, "middle": np.nan, "lower": np.nan}
+        tail = close[-period:]
+        middle = float(tail.mean())
+        # Sample std, as pandas' rolling std reported before
+        std = float(tail.std(ddof=1))
+        return {"upper": middle + 2 * std, "middle": middle, "lower": middle - 2 * std}
+
+    def _calculate_vwap(
+        self, high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray
+    ) -> float:
+        typical_price = (high + low + close) / 3
+        return float(typical_price @ volume / volume.sum())
+
+    def _calculate_rsi(self, close: np.ndarray, period: int = 14) -> float:
+        return float(_last_rsi(close, period))
+
+    def _calculate_stochastic(
+        self, high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14, smooth: int = 3
+    ) -> Dict[str, float]:
+        if close.size < period:
+            return {"k": np.nan, "d": np.nan}
+        # %D averages the last ``smooth`` %K values, so only that tail is windowed
+        tail = slice(-(period + smooth - 1), None)
+        low_min = bn.move_min(low[tail], period)[-smooth:]
+        high_max = bn.move_max(high[tail], period)[-smooth:]
+        k = 100 * (close[tail][-smooth:] - low_min) / (high_max - low_min)
+        return {"k": float(k[-1]), "d": float(k.mean())}
+
+    def _true_range(self, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+        """max(high - low, |high - prev close|, |low - prev close|) in one fused pass"""
+        prev_close = np.empty_like(close)
+        prev_close[0] = close[0]
+        prev_close[1:] = close[:-1]
+        return np.maximum(
+            high - low,
+            np.maximum(np.abs(high - prev_close), np.abs(low - prev_close))
+        )
+
+    def _calculate_atr(
+        self, high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14
+    ) -> float:
+        if close.size < period:
+            return np.nan
+        # One extra bar supplies the previous close for the window's first true range
+        tail = slice(-period - 1, None) if close.size > period else slice(None)
+        return float(self._true_range(high[tail], low[tail], close[tail])[-period:].mean())
+
+    def _calculate_atr_series(self, df: pd.DataFrame, period: int = 14) -> pd.Series:
+        true_range = self._true_range(
+            *(df[column].to_numpy(dtype=np.float64) for column in ("high", "low", "close"))
+        )
+        return pd.Series(bn.move_mean(true_range, period, min_count=period), index=df.index)
 
     def analyze_chart_patterns(self, df: pd.DataFrame) -> List[ChartPattern]:
         """Identify chart patterns in price action"""
+        cache_key = frame_key(df)
+        cached = self._chart_pattern_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+
         patterns = []
         
         # Check for common patterns
@@ -251,8 +522,55 @@ class TechnicalAnalysis:
         patterns.extend(self._find_channels(df))
         patterns.extend(self._find_wedges(df))
         
+        self._chart_pattern_cache.put(cache_key, list(patterns))
         return patterns
 
+    def analyze_chart_patterns_batch(
+        self, windows: np.ndarray, index: Optional[pd.Index] = None
+    ) -> List[List[ChartPattern]]:
+        """Identify chart patterns for a stack of overlapping OHLCV windows
+
+        ``windows`` has shape (n_windows, window_size, 5) in OHLCV_COLUMNS order with
+        consecutive windows offset by one candle, e.g. a ``sliding_window_view`` over
+        the raw price array. ``index`` labels the underlying series (its first
+        n_windows + window_size - 1 entries are used) so formation point times match
+        analyze_chart_patterns; without it they are integer positions. The series is
+        scanned once and every detected pattern is assigned to each window that
+        fully contains its formation.
+
+        This is not bit-identical to calling analyze_chart_patterns per window: ATR
+        is warmed up over the whole series rather than restarting at each window,
+        and find_peaks' spacing and prominence (PEAK_PROMINENCE_ATR times the mean
+        ATR) are judged over the whole series, so peaks near a window edge or in a
+        window much calmer than average can differ.
+        """
+        n_windows, window_size, _ = windows.shape
+        results: List[List[ChartPattern]] = [[] for _ in range(n_windows)]
+        if n_windows == 0:
+            return results
+
+        series = np.concatenate([windows[0], windows[1:, -1]])
+        df = pd.DataFrame(
+            series,
+            columns=OHLCV_COLUMNS,
+            index=None if index is None else index[:len(series)]
+        )
+        df['atr'] = self._calculate_atr_series(df)
+
+        scans = [
+            (self._scan_double_tops_bottoms, 20),
+            (self._scan_head_and_shoulders, 30),
+        ]
+        for scan, lookback in scans:
+            for end, pattern in scan(df, lookback):
+                # Window k contains [end - lookback, end) when k + lookback <= end < k + window_size
+                first = max(0, end - window_size + 1)
+                last = min(n_windows - 1, end - lookback)
+                for k in range(first, last + 1):
+                    results[k].append(pattern)
+
+        return results
+
     def analyze_candlestick_patterns(self, df: pd.DataFrame) -> List[CandlestickPattern]:
         """Identify Japanese candlestick patterns"""
         patterns = []
@@ -270,75 +588,77 @@ class TechnicalAnalysis:
 
     def _find_double_tops_bottoms(self, df: pd.DataFrame) -> List[ChartPattern]:
         """Identify double top/bottom reversal patterns"""
-        patterns = []
-        window = 20  # Look back period
-        
-        for i in range(window, len(df)):
-            slice_df = df.iloc[i-window:i]
-            peaks = self._find_peaks(slice_df['high'])
-            troughs = self._find_peaks(-slice_df['low'])
-            
-            # Check for double tops
-            if len(peaks) >= 2:
-                if self._validate_double_top(slice_df, peaks):
-                    patterns.append(ChartPattern(
-                        pattern_type="double_top",
-                        confidence=self._calculate_pattern_confidence(slice_df, peaks),
-                        price_target=self._calculate_price_target(slice_df, peaks, pattern="double_top"),
-                        stop_loss=max(peaks) + (slice_df['atr'].iloc[-1] * 1.5),
-                        formation_points=[{"price": p, "time": slice_df.index[i]} for i, p in enumerate(peaks)],
-                        volume_confirms=self._check_volume_confirmation(slice_df, peaks)
-                    ))
-            
-            # Check for double bottoms
-            if len(troughs) >= 2:
-                if self._validate_double_bottom(slice_df, troughs):
-                    patterns.append(ChartPattern(
-                        pattern_type="double_bottom",
-                        confidence=self._calculate_pattern_confidence(slice_df, troughs),
-                        price_target=self._calculate_price_target(slice_df, troughs, pattern="double_bottom"),
-                        stop_loss=min(troughs) - (slice_df['atr'].iloc[-1] * 1.5),
-                        formation_points=[{"price": p, "time": slice_df.index[i]} for i, p in enumerate(troughs)],
-                        volume_confirms=self._check_volume_confirmation(slice_df, troughs)
-                    ))
-        
-        return patterns
+        return [pattern for _, pattern in self._scan_double_tops_bottoms(df)]
+
+    def _scan_double_tops_bottoms(
+        self, df: pd.DataFrame, window: int = 20
+    ) -> Iterator[Tuple[int, ChartPattern]]:
+        """Yield (end position, pattern) for double tops/bottoms in each look back window"""
+        return self._scan_extrema_patterns(
+            df, window, _double_top_scan, DOUBLE_TOP_TOLERANCE,
+            ("double_top", "double_bottom"), stop_atr=1.5
+        )
 
     def _find_head_and_shoulders(self, df: pd.DataFrame) -> List[ChartPattern]:
         """Identify head and shoulders patterns (both regular and inverse)"""
-        patterns = []
-        window = 30
-        
-        for i in range(window, len(df)):
-            slice_df = df.iloc[i-window:i]
-            peaks = self._find_peaks(slice_df['high'])
-            troughs = self._find_peaks(-slice_df['low'])
-            
-            # Check for regular H&S
-            if len(peaks) >= 3:
-                if self._validate_head_and_shoulders(slice_df, peaks):
-                    patterns.append(ChartPattern(
-                        pattern_type="head_and_shoulders",
-                        confidence=self._calculate_pattern_confidence(slice_df, peaks),
-                        price_target=self._calculate_hs_target(slice_df, peaks),
-                        stop_loss=max(peaks) + (slice_df['atr'].iloc[-1] * 2),
-                        formation_points=self._get_hs_points(slice_df, peaks),
-                        volume_confirms=self._check_hs_volume(slice_df, peaks)
-                    ))
-            
-            # Check for inverse H&S
-            if len(troughs) >= 3:
-                if self._validate_inverse_head_and_shoulders(slice_df, troughs):
-                    patterns.append(ChartPattern(
-                        pattern_type="inverse_head_and_shoulders",
-                        confidence=self._calculate_pattern_confidence(slice_df, troughs),
-                        price_target=self._calculate_ihs_target(slice_df, troughs),
-                        stop_loss=min(troughs) - (slice_df['atr'].iloc[-1] * 2),
-                        formation_points=self._get_ihs_points(slice_df, troughs),
-                        volume_confirms=self._check_ihs_volume(slice_df, troughs)
-                    ))
-        
-        return patterns
+        return [pattern for _, pattern in self._scan_head_and_shoulders(df)]
+
+    def _scan_head_and_shoulders(
+        self, df: pd.DataFrame, window: int = 30
+    ) -> Iterator[Tuple[int, ChartPattern]]:
+        """Yield (end position, pattern) for regular and inverse H&S in each look back window"""
+        return self._scan_extrema_patterns(
+            df, window, _head_and_shoulders_scan, SHOULDER_TOLERANCE,
+            ("head_and_shoulders", "inverse_head_and_shoulders"), stop_atr=2.0
+        )
+
+    def _scan_extrema_patterns(
+        self,
+        df: pd.DataFrame,
+        window: int,
+        kernel,
+        tolerance: float,
+        pattern_types: Tuple[str, str],
+        stop_atr: float
+    ) -> Iterator[Tuple[int, ChartPattern]]:
+        """Run a top/bottom scan kernel over every look back window df.iloc[i-window:i]
+
+        Peaks and troughs are found once over the whole series with scipy's
+        find_peaks, filtered by spacing and by prominence relative to the average
+        ATR; each window takes the ones strictly inside it by binary search. The
+        kernel checks all windows in parallel and ChartPatterns are built for hits only.
+        """
+        high = df['high'].to_numpy(dtype=np.float64)
+        low = df['low'].to_numpy(dtype=np.float64)
+        volume = df['volume'].to_numpy(dtype=np.float64)
+        atr = df['atr'].to_numpy(dtype=np.float64)
+        atr_level = np.nanmean(atr) if np.isfinite(atr).any() else 0.0
+        options = {"distance": PEAK_DISTANCE, "prominence": PEAK_PROMINENCE_ATR * atr_level}
+
+        # A window's first and last bars lack a neighbour inside it
+        ends = np.arange(window, len(df))
+        bounds = [ends - window + 1, ends - 1]
+        sides = []
+        for sign, x, y in ((1.0, high, low), (-1.0, -low, -high)):
+            extrema, _ = find_peaks(x, **options)
+            first, last = extrema.searchsorted(bounds)
+            sides.append((sign, sign * x, kernel(x, y, volume, extrema, first, last, atr[ends - 1], tolerance)))
+
+        for k in np.flatnonzero(sides[0][2][0] | sides[1][2][0]).tolist():
+            i = int(ends[k])
+            for (sign, prices, (hits, confs, targets, confirms, points)), pattern_type in zip(sides, pattern_types):
+                if not hits[k]:
+                    continue
+                formation = points[k].tolist()
+                extreme = sign * max(sign * prices[j] for j in formation)
+                yield i, ChartPattern(
+                    pattern_type=pattern_type,
+                    confidence=float(confs[k]),
+                    price_target=float(sign * targets[k]),
+                    stop_loss=float(extreme + sign * stop_atr * atr[i - 1]),
+                    formation_points=[{"price": float(prices[j]), "time": df.index[j]} for j in formation],
+                    volume_confirms=bool(confirms[k])
+                )
 
     def _find_triangles(self, df: pd.DataFrame) -> List[ChartPattern]:
         """Identify ascending, descending, and symmetric triangles"""
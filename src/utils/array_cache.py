@@ -0,0 +1,84 @@
+"""
+Content-addressed LRU cache for results computed from price arrays.
+
+ndarrays and DataFrames are unhashable, so entries are keyed by a BLAKE2b
+digest of the underlying bytes.
+"""
+import hashlib
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
+
+import numpy as np
+import orjson
+import pandas as pd
+
+
+def content_key(*arrays: np.ndarray) -> bytes:
+    """Digest of the shape, dtype and contents of the given arrays"""
+    digest = hashlib.blake2b(digest_size=16)
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(f"{array.shape}{array.dtype.str}".encode())
+        digest.update(array.data)
+    return digest.digest()
+
+
+def frame_key(df: pd.DataFrame) -> bytes:
+    """Digest of a DataFrame's values and index"""
+    return content_key(pd.util.hash_pandas_object(df, index=True).to_numpy())
+
+
+def _jsonable(obj: Any) -> Any:
+    # Non-contiguous arrays fall through OPT_SERIALIZE_NUMPY to here; a contiguous
+    # copy serializes exactly like an array that was contiguous to begin with
+    if isinstance(obj, np.ndarray):
+        return np.ascontiguousarray(obj)
+    # Hash pandas objects in full: their str() form is truncated
+    if isinstance(obj, (pd.Series, pd.DataFrame, pd.Index)):
+        return {
+            "type": type(obj).__name__,
+            "hash": pd.util.hash_pandas_object(obj, index=not isinstance(obj, pd.Index)).to_numpy()
+        }
+    if isinstance(obj, pd.Timestamp):
+        return obj.isoformat()
+    if isinstance(obj, MappingProxyType):
+        return dict(obj)
+    raise TypeError(f"Cannot build a cache key from {type(obj).__name__}")
+
+
+def mapping_key(data: Mapping) -> bytes:
+    """Digest of a JSON-like mapping whose values may include ndarrays and pandas objects
+
+    Raises TypeError when a value has no exact serialization, rather than
+    risking two different payloads sharing a key.
+    """
+    payload = orjson.dumps(
+        data,
+        default=_jsonable,
+        option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    )
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
+
+class ArrayLRUCache:
+    def __init__(self, maxsize: int = 32):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[bytes, Any]" = OrderedDict()
+
+    def get(self, key: bytes) -> Optional[Any]:
+        """Return the cached value and mark it as most recently used"""
+        if key not in self._entries:
+            return None
+        self._entries.move_to_end(key)
+        return self._entries[key]
+
+    def put(self, key: bytes, value: Any) -> None:
+        """Store a value, evicting the least recently used entry when full"""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
@@ -1,19 +1,35 @@
+import os
+from functools import lru_cache
 import yaml
-from typing import Dict, Any
+from typing import Dict, Any, FrozenSet, Tuple
 from pathlib import Path
 from loguru import logger
 
+# libyaml's C loader when PyYAML was built with it, the pure-Python one otherwise
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+@lru_cache(maxsize=8)
+def _parse_config(path: Path, mtime: float) -> Dict[str, Any]:
+    """Parse a YAML config once per (path, mtime); editing the file invalidates it
+
+    The parsed dict is shared by every IndicatorConfig for that file, so treat it
+    as read-only.
+    """
+    with open(path) as f:
+        return yaml.load(f, Loader=_YAML_LOADER)
+
 class IndicatorConfig:
     def __init__(self, config_path: str = "config/indicators.yml"):
         self.config = self._load_config(config_path)
+        self._enabled = self._enabled_indicators(self.config)
 
     def _load_config(self, path: str) -> Dict[str, Any]:
         """Load configuration from YAML file"""
         try:
-            with open(Path(path)) as f:
-                return yaml.safe_load(f)
+            path = Path(path)
+            return _parse_config(path, os.path.getmtime(path))
         except Exception as e:
-            logger.error(f"Error loading indicator config: {e}")
+            logger.error("Error loading indicator config: {}", e)
             return self._get_default_config()
 
     def _get_default_config(self) -> Dict[str, Any]:
@@ -39,16 +55,22 @@ class IndicatorConfig:
             }
         }
 
+    def _enabled_indicators(self, config: Dict[str, Any]) -> FrozenSet[Tuple[str, str]]:
+        """(category, indicator) pairs enabled at every level of the config"""
+        analysis = (config or {}).get("technical_analysis") or {}
+        if not analysis.get("enabled"):
+            return frozenset()
+        return frozenset(
+            (category, indicator)
+            for category, section in analysis.items()
+            if isinstance(section, dict) and section.get("enabled")
+            for indicator, settings in (section.get("indicators") or {}).items()
+            if isinstance(settings, dict) and settings.get("enabled")
+        )
+
     def is_indicator_enabled(self, category: str, indicator: str) -> bool:
         """Check if specific indicator is enabled"""
-        try:
-            return (
-                self.config["technical_analysis"]["enabled"] and
-                self.config["technical_analysis"][category]["enabled"] and
-                self.config["technical_analysis"][category]["indicators"][indicator]["enabled"]
-            )
-        except KeyError:
-            return False
+        return (category, indicator) in self._enabled
 
     def get_indicator_config(self, category: str, indicator: str) -> Dict:
         """Get configuration for specific indicator"""
@@ -0,0 +1,38 @@
+"""
+Optional Numba JIT support.
+
+Kernels decorated with ``njit`` are compiled by Numba when it is installed and
+run as plain Python otherwise, so numeric code keeps working without the
+``jit`` extra.
+
+Kernels are declared with ``cache=True``; compiled artifacts go to a single
+cache directory (``NUMBA_CACHE_DIR``, defaulting to ``.numba_cache`` at the
+repository root) so backtest worker processes load what the parent process
+already compiled instead of paying JIT warm-up each.
+"""
+import os
+from pathlib import Path
+from typing import Any, Callable
+
+# Must be set before numba is imported; an explicit environment value wins
+NUMBA_CACHE_DIR = os.environ.setdefault(
+    "NUMBA_CACHE_DIR", str(Path(__file__).resolve().parents[2] / ".numba_cache")
+)
+
+try:
+    from numba import njit, prange
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args: Any, **kwargs: Any) -> Callable:
+        """No-op stand-in for ``numba.njit`` supporting bare and parametrized use"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func: Callable) -> Callable:
+            return func
+
+        return decorator
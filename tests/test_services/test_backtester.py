@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+from scipy.stats import norm
+
+from src.services.backtester import STRIKE_GRID, Backtester
+
+# Fang & Oosterlee (2008), Heston test case: S0 = K = 100, T = 1, r = 0
+HESTON_PARAMS = {'v0': 0.0175, 'kappa': 1.5768, 'theta': 0.0398, 'sigma': 0.5751, 'rho': -0.5711}
+HESTON_REFERENCE_CALL = 5.785155450
+
+
+@pytest.fixture
+def backtester() -> Backtester:
+    return Backtester()
+
+
+def _black_scholes_call(S0: float, K: np.ndarray, T: float, vol: float) -> np.ndarray:
+    d1 = (np.log(S0 / K) + 0.5 * vol ** 2 * T) / (vol * np.sqrt(T))
+    d2 = d1 - vol * np.sqrt(T)
+    return S0 * norm.cdf(d1) - K * norm.cdf(d2)
+
+
+def test_heston_call_matches_reference(backtester: Backtester):
+    calls = backtester._price_strikes_vectorized(100.0, 1.0, 0.0, np.array([100.0]), HESTON_PARAMS)
+    assert calls[0] == pytest.approx(HESTON_REFERENCE_CALL, abs=1e-5)
+
+
+def test_heston_collapses_to_black_scholes_without_vol_of_vol(backtester: Backtester):
+    strikes = 100.0 * STRIKE_GRID
+    params = {'v0': 0.04, 'kappa': 2.0, 'theta': 0.04, 'sigma': 1e-4, 'rho': 0.0}
+    calls = backtester._price_strikes_vectorized(100.0, 0.5, 0.0, strikes, params)
+    np.testing.assert_allclose(calls, _black_scholes_call(100.0, strikes, 0.5, 0.2), atol=1e-4)
+
+
+def test_simulated_chain_satisfies_put_call_parity(backtester: Backtester):
+    entry_price = 30000.0
+    chain = backtester._simulate_options_prices(entry_price, 50.0, {'expiry_days': 30})
+
+    np.testing.assert_allclose(chain["strikes"], entry_price * STRIKE_GRID)
+    np.testing.assert_allclose(
+        chain["calls"] - chain["puts"], entry_price - chain["strikes"], rtol=0, atol=1e-8 * entry_price
+    )
+    # Both legs carry time value, so neither side is below intrinsic
+    assert np.all(chain["calls"] >= np.maximum(entry_price - chain["strikes"], 0.0))
+    assert np.all(chain["puts"] >= np.maximum(chain["strikes"] - entry_price, 0.0))
+
+
+def test_run_vectorized_matches_hand_computed_curve(backtester: Backtester):
+    prices = np.array([100.0, 110.0, 88.0, 90.0, 100.0, 120.0, 108.0])
+    # Long bars 0-2, flat, then long from bar 4 until the series ends
+    signals = np.array([1, 0, -1, 0, 1, 0, 0])
+
+    result = backtester.run_vectorized(signals, prices, initial_capital=1000.0)
+
+    # +10%, -20%, flat, flat, +20%, -10%
+    np.testing.assert_allclose(result.equity_curve, [1000.0, 1100.0, 880.0, 880.0, 880.0, 1056.0, 950.4])
+    assert result.total_trades == 2
+    assert result.winning_trades == 1
+    assert [(t["entry_index"], t["exit_index"]) for t in result.trades] == [(0, 2), (4, 6)]
+    np.testing.assert_allclose([t["pnl"] for t in result.trades], [-120.0, 70.4])
+    assert result.total_pnl == pytest.approx(-49.6)
+    # Peak 1100 to trough 880
+    assert result.max_drawdown == pytest.approx(0.2)
@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+from numpy.lib.stride_tricks import sliding_window_view
+
+from src.services.crypto_patterns import (
+    ORDERBLOCK_VOLUME_RATIO,
+    SPRING_LOOKBACK,
+    _orderblock_scan,
+    _wyckoff_spring_scan,
+)
+
+
+def _random_ohlcv(seed: int, n: int = 1500):
+    rng = np.random.default_rng(seed)
+    close = 100.0 + np.cumsum(rng.normal(0.0, 1.0, n))
+    open_ = np.concatenate([[100.0], close[:-1]])
+    high = np.maximum(open_, close) + rng.uniform(0.0, 1.0, n)
+    low = np.minimum(open_, close) - rng.uniform(0.0, 1.0, n)
+    volume = rng.uniform(1.0, 10.0, n)
+    return open_, high, low, close, volume
+
+
+def _windows(window: int, *columns):
+    return [sliding_window_view(col, window) for col in columns]
+
+
+def _spring_reference(h, l, c, v):
+    split = len(l) - SPRING_LOOKBACK
+    support = min(l[:split])
+    dip = split + int(np.argmin(l[split:]))
+    high_max, mean_volume = max(h), sum(v) / len(v)
+    if l[dip] >= support or c[-1] <= support or v[dip] < mean_volume:
+        return 0.0, np.nan, np.nan
+    depth = (support - l[dip]) / (high_max - support) if high_max > support else 1.0
+    confidence = 0.5 * min(v[dip] / mean_volume / 2, 1.0) + 0.5 * (1 - min(depth / 0.25, 1.0))
+    return confidence, high_max, l[dip]
+
+
+def _orderblock_reference(o, h, l, c, v):
+    j = len(l) - 2
+    mean_volume = sum(v) / len(v)
+    if v[j] < ORDERBLOCK_VOLUME_RATIO * mean_volume:
+        return 0.0, np.nan, np.nan
+    strength = min(v[j] / (2 * ORDERBLOCK_VOLUME_RATIO * mean_volume), 1.0)
+    if c[j] < o[j] and c[-1] > h[j]:
+        return strength, max(h), l[j]
+    if c[j] > o[j] and c[-1] < l[j]:
+        return strength, min(l), h[j]
+    return 0.0, np.nan, np.nan
+
+
+def _assert_rows_match(scores, reference, window, n):
+    assert scores.shape == (n, 3)
+    np.testing.assert_array_equal(scores[:window], 0.0)
+    for i in range(window, n):
+        # Row i scores the window df.iloc[i-window:i]
+        np.testing.assert_allclose(scores[i], reference(i - window, i), equal_nan=True, err_msg=f"row {i}")
+    assert (scores[:, 0] > 0).any()
+
+
+def test_wyckoff_spring_scan_matches_per_window_loop():
+    window = 30
+    _, high, low, close, volume = _random_ohlcv(seed=11)
+    h_win, l_win, c_win, v_win = _windows(window, high, low, close, volume)
+
+    scores = _wyckoff_spring_scan(
+        h_win, l_win, c_win, v_win, h_win.max(axis=1), v_win.mean(axis=1)
+    )
+
+    _assert_rows_match(
+        scores,
+        lambda start, end: _spring_reference(high[start:end], low[start:end], close[start:end], volume[start:end]),
+        window,
+        close.size,
+    )
+
+
+def test_orderblock_scan_matches_per_window_loop():
+    window = 15
+    open_, high, low, close, volume = _random_ohlcv(seed=11)
+    o_win, h_win, l_win, c_win, v_win = _windows(window, open_, high, low, close, volume)
+
+    scores = _orderblock_scan(
+        o_win, h_win, l_win, c_win, v_win, h_win.max(axis=1), l_win.min(axis=1), v_win.mean(axis=1)
+    )
+
+    _assert_rows_match(
+        scores,
+        lambda start, end: _orderblock_reference(
+            open_[start:end], high[start:end], low[start:end], close[start:end], volume[start:end]
+        ),
+        window,
+        close.size,
+    )
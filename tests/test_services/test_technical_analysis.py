@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+from scipy.signal import find_peaks
+
+from src.services.technical_analysis import (
+    DOUBLE_TOP_TOLERANCE,
+    PEAK_DISTANCE,
+    SHOULDER_TOLERANCE,
+    _double_top_scan,
+    _head_and_shoulders_scan,
+)
+
+WINDOW = 30
+
+
+def _random_bars(seed: int, n: int = 2000):
+    rng = np.random.default_rng(seed)
+    close = 100.0 + np.cumsum(rng.normal(0.0, 1.0, n))
+    spread = rng.uniform(0.2, 1.5, n)
+    high, low = close + spread, close - spread
+    volume = rng.uniform(1.0, 10.0, n)
+    atr = np.full(n, 0.5)
+    return high, low, volume, atr
+
+
+def _double_top_reference(x, y, volume, tops, atr, tolerance):
+    a, b = tops[-2:]
+    top = max(x[a], x[b])
+    gap = abs(x[a] - x[b]) / abs(top)
+    neckline = min(y[a:b + 1])
+    depth = min(x[a], x[b]) - neckline
+    if gap > tolerance or not depth > atr:
+        return None
+    confirms = volume[b] < volume[a]
+    conf = 0.5 * (1 - gap / tolerance) + 0.3 * min(depth / (3 * atr), 1.0) + (0.2 if confirms else 0.0)
+    return conf, neckline - (top - neckline), confirms, [a, b]
+
+
+def _head_and_shoulders_reference(x, y, volume, tops, atr, tolerance):
+    left, head, right = tops[-3:]
+    shoulder = max(x[left], x[right])
+    if x[head] <= shoulder:
+        return None
+    gap = abs(x[left] - x[right]) / abs(shoulder)
+    neckline = min(y[left:right + 1])
+    depth = x[head] - neckline
+    if gap > tolerance or not depth > atr:
+        return None
+    confirms = volume[right] < volume[left]
+    conf = 0.5 * (1 - gap / tolerance) + 0.3 * min((x[head] - shoulder) / atr, 1.0) + (0.2 if confirms else 0.0)
+    return conf, neckline - depth, confirms, [left, head, right]
+
+
+@pytest.mark.parametrize(
+    "kernel, reference, tolerance, size",
+    [
+        (_double_top_scan, _double_top_reference, DOUBLE_TOP_TOLERANCE, 2),
+        (_head_and_shoulders_scan, _head_and_shoulders_reference, SHOULDER_TOLERANCE, 3),
+    ],
+)
+@pytest.mark.parametrize("bottoms", [False, True])
+def test_extrema_scan_matches_per_window_loop(kernel, reference, tolerance, size, bottoms):
+    high, low, volume, atr = _random_bars(seed=7)
+    x, y = (-low, -high) if bottoms else (high, low)
+    extrema, _ = find_peaks(x, distance=PEAK_DISTANCE, prominence=0.5)
+
+    ends = np.arange(WINDOW, x.size)
+    first, last = extrema.searchsorted([ends - WINDOW + 1, ends - 1])
+    hits, confs, targets, confirms, points = kernel(
+        x, y, volume, extrema, first, last, atr[ends - 1], tolerance
+    )
+
+    for k, i in enumerate(ends):
+        # Extrema with a neighbour on both sides inside df.iloc[i-window:i]
+        tops = [int(p) for p in extrema if i - WINDOW < p < i - 1]
+        expected = reference(x, y, volume, tops, atr[i - 1], tolerance) if len(tops) >= size else None
+        assert hits[k] == (expected is not None), f"window ending at {i}"
+        if expected is None:
+            continue
+        conf, target, confirm, formation = expected
+        assert confs[k] == pytest.approx(conf)
+        assert targets[k] == pytest.approx(target)
+        assert confirms[k] == confirm
+        assert points[k].tolist() == formation
+
+    assert hits.any()